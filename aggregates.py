@@ -0,0 +1,392 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from metrics import build_leaderboard, build_results_summary, lower_is_better, summary_record, summary_frame
+
+# =========================
+# INCREMENTAL AGGREGATES
+# =========================
+# The sheet is append-only in practice: a testing day adds rows at the bottom.
+# AggregateState folds rows into running per-key aggregates and, on refresh,
+# only applies the rows past the last one it has seen. The rows it has already
+# seen are checked against a content hash of that prefix, so if any of them
+# was edited or removed it rebuilds from scratch.
+#
+#   player_metrics[player][metric] -> running best / first / latest by date
+#   leaderboards[metric][(player, age)] -> best Average and latest test date
+#   team_daily[team][(date, metric)] -> sums and counts for team means
+#                                        (undated rows under NaT)
+#
+# Leaderboard and team reads are memoized, so they can be computed ahead of
+# time (see warmup.py). An update drops the reads of every metric and team in
+# `changes` (see dirty.py), or all of them when no changes are given.
+
+MAX_MEMOIZED_READS = 1024  # custom date ranges would otherwise grow this without bound
+
+# Flat-table form of the state, written into snapshots (see to_tables)
+PLAYER_METRIC_FIELDS = [
+    "min_lowest", "max_highest",
+    "first_date", "first_lowest", "first_highest",
+    "latest_date", "latest_lowest", "latest_highest",
+]
+AGGREGATE_TABLES = {
+    "agg_player_metrics": ["full_name", "Metric_Type"] + PLAYER_METRIC_FIELDS,
+    "agg_leaderboards": ["Metric_Type", "full_name", "Age", "min_avg", "max_avg", "last_date"],
+    "agg_team_daily": ["Team", "Date", "Metric_Type", "sum_avg", "n_avg", "sum_age", "n_age"],
+}
+
+
+def _is_later(date, than):
+    # NaT sorts before every real date
+    if pd.isna(date):
+        return False
+    return pd.isna(than) or date >= than
+
+
+def _is_earlier(date, than):
+    if pd.isna(date):
+        return False
+    return pd.isna(than) or date < than
+
+
+def _table_rows(table):
+    # Plain Python values; much cheaper than itertuples on datetime columns
+    return zip(*(table[col].tolist() for col in table.columns))
+
+
+def _hash_total(row_hashes):
+    return int(row_hashes.sum()) & (2**64 - 1)
+
+
+class AggregateState:
+    def __init__(self):
+        self.version = None
+        self.row_count = 0
+        self._seen_hash = None  # _hash_total of the first row_count rows
+        self._lock = threading.Lock()
+        self.player_metrics = {}
+        self.leaderboards = {}
+        self.team_daily = {}
+        self._reads = {}
+        self._generation = 0
+
+    # ---------------------------
+    # REFRESH
+    # ---------------------------
+    def update(self, df, version=None, changes=None):
+        # Returns the number of rows that were folded in
+        with self._lock:
+            if version is not None and version == self.version:
+                return 0
+
+            row_hashes = pd.util.hash_pandas_object(df, index=False)
+            appended = (
+                self.row_count > 0
+                and len(df) >= self.row_count
+                and _hash_total(row_hashes.iloc[:self.row_count]) == self._seen_hash
+            )
+            if appended:
+                new_rows = df.iloc[self.row_count:]
+            else:
+                self.player_metrics = {}
+                self.leaderboards = {}
+                self.team_daily = {}
+                new_rows = df
+
+            if not new_rows.empty:
+                self._apply(new_rows)
+
+            self.row_count = len(df)
+            self._seen_hash = _hash_total(row_hashes)
+            self.version = version
+            self._drop_reads(changes)
+            self._generation += 1
+            return len(new_rows)
+
+    def load_tables(self, tables, version, changes=None):
+        # Replace the state with one precomputed by to_tables, e.g. from a
+        # snapshot, instead of folding in the rows
+        with self._lock:
+            if version == self.version:
+                return
+            self.player_metrics = {}
+            for player, metric, *values in _table_rows(tables["agg_player_metrics"]):
+                self.player_metrics.setdefault(player, {})[metric] = dict(zip(PLAYER_METRIC_FIELDS, values))
+            self.leaderboards = {}
+            for metric, player, age, *entry in _table_rows(tables["agg_leaderboards"]):
+                self.leaderboards.setdefault(metric, {})[(player, age)] = entry
+            self.team_daily = {}
+            for team, date, metric, *acc in _table_rows(tables["agg_team_daily"]):
+                date = pd.NaT if pd.isna(date) else date
+                metric = None if pd.isna(metric) else metric
+                self.team_daily.setdefault(team, {})[(date, metric)] = acc
+
+            # Not built from a frame, so the next update() rebuilds from scratch
+            self.row_count = 0
+            self._seen_hash = None
+            self.version = version
+            self._drop_reads(changes)
+            self._generation += 1
+
+    def to_tables(self):
+        with self._lock:
+            rows = {
+                "agg_player_metrics": [
+                    (player, metric, *(rec[field] for field in PLAYER_METRIC_FIELDS))
+                    for player, records in self.player_metrics.items()
+                    for metric, rec in records.items()
+                ],
+                "agg_leaderboards": [
+                    (metric, player, age, *entry)
+                    for metric, entries in self.leaderboards.items()
+                    for (player, age), entry in entries.items()
+                ],
+                "agg_team_daily": [
+                    (team, date, metric, *acc)
+                    for team, days in self.team_daily.items()
+                    for (date, metric), acc in days.items()
+                ],
+            }
+        return {name: pd.DataFrame(rows[name], columns=columns) for name, columns in AGGREGATE_TABLES.items()}
+
+    def _drop_reads(self, changes):
+        if changes is None or changes.full:
+            self._reads = {}
+            return
+        self._reads = {
+            key: value for key, value in self._reads.items()
+            if not (key[0] == "leaderboard" and key[1] in changes.metrics)
+            and not (key[0] in ("team_trend", "team_means") and key[1] in changes.teams)
+        }
+
+    def _apply(self, rows):
+        self._apply_player_metrics(rows)
+        self._apply_leaderboards(rows)
+        self._apply_team_daily(rows)
+
+    def _apply_player_metrics(self, rows):
+        keys = ["full_name", "Metric_Type"]
+        ordered = rows.sort_values("Date", kind="stable")
+        stats = ordered.groupby(keys, sort=False).agg(
+            min_lowest=("Lowest", "min"),
+            max_highest=("Highest", "max")
+        )
+        # One row per (player, metric) with its first and latest test side by side
+        values = ["Date", "Lowest", "Highest"]
+        firsts = ordered.drop_duplicates(keys, keep="first").set_index(keys)[values]
+        latests = ordered.drop_duplicates(keys, keep="last").set_index(keys)[values]
+        groups = stats.join(firsts.add_prefix("first_")).join(latests.add_prefix("latest_"))
+
+        for (
+            (player, metric), min_lowest, max_highest,
+            first_date, first_lowest, first_highest,
+            latest_date, latest_lowest, latest_highest
+        ) in groups.itertuples(name=None):
+            records = self.player_metrics.setdefault(player, {})
+            rec = records.get(metric)
+
+            if rec is None:
+                records[metric] = {
+                    "min_lowest": min_lowest,
+                    "max_highest": max_highest,
+                    "first_date": first_date,
+                    "first_lowest": first_lowest,
+                    "first_highest": first_highest,
+                    "latest_date": latest_date,
+                    "latest_lowest": latest_lowest,
+                    "latest_highest": latest_highest,
+                }
+                continue
+
+            rec["min_lowest"] = np.fmin(rec["min_lowest"], min_lowest)
+            rec["max_highest"] = np.fmax(rec["max_highest"], max_highest)
+            if _is_earlier(first_date, rec["first_date"]):
+                rec["first_date"] = first_date
+                rec["first_lowest"] = first_lowest
+                rec["first_highest"] = first_highest
+            if _is_later(latest_date, rec["latest_date"]):
+                rec["latest_date"] = latest_date
+                rec["latest_lowest"] = latest_lowest
+                rec["latest_highest"] = latest_highest
+
+    def _apply_leaderboards(self, rows):
+        stats = rows.groupby(["Metric_Type", "full_name", "Age"], sort=False, dropna=False).agg(
+            min_avg=("Average", "min"),
+            max_avg=("Average", "max"),
+            last_date=("Date", "max")
+        )
+        for (metric, player, age), min_avg, max_avg, last_date in zip(
+            stats.index, stats["min_avg"], stats["max_avg"], stats["last_date"]
+        ):
+            entries = self.leaderboards.setdefault(metric, {})
+            entry = entries.get((player, age))
+            if entry is None:
+                entries[(player, age)] = [min_avg, max_avg, last_date]
+            else:
+                entry[0] = np.fmin(entry[0], min_avg)
+                entry[1] = np.fmax(entry[1], max_avg)
+                if _is_later(last_date, entry[2]):
+                    entry[2] = last_date
+
+    def _apply_team_daily(self, rows):
+        # Undated rows (and rows with no metric) still count towards the
+        # all-time team means, as they did when these came from the rows
+        stats = rows.groupby(["Team", "Date", "Metric_Type"], sort=False, dropna=False).agg(
+            sum_avg=("Average", "sum"),
+            n_avg=("Average", "count"),
+            sum_age=("Age", "sum"),
+            n_age=("Age", "count")
+        )
+        for (team, date, metric), sum_avg, n_avg, sum_age, n_age in zip(
+            stats.index, stats["sum_avg"], stats["n_avg"], stats["sum_age"], stats["n_age"]
+        ):
+            if pd.isna(team):
+                continue
+            date = pd.NaT if pd.isna(date) else date
+            metric = None if pd.isna(metric) else metric
+            days = self.team_daily.setdefault(team, {})
+            acc = days.get((date, metric))
+            if acc is None:
+                days[(date, metric)] = [sum_avg, n_avg, sum_age, n_age]
+            else:
+                acc[0] += sum_avg
+                acc[1] += n_avg
+                acc[2] += sum_age
+                acc[3] += n_age
+
+    # ---------------------------
+    # READS
+    # ---------------------------
+    def _memoized(self, key, build):
+        # Results built against an older generation are returned but not kept
+        with self._lock:
+            if key in self._reads:
+                return self._reads[key]
+            generation = self._generation
+        value = build()
+        with self._lock:
+            if generation == self._generation:
+                if len(self._reads) >= MAX_MEMOIZED_READS:
+                    del self._reads[next(iter(self._reads))]
+                self._reads[key] = value
+        return value
+
+    def results_summary(self, player, age_group):
+        with self._lock:
+            rows = []
+            for metric, rec in self.player_metrics.get(player, {}).items():
+                if metric in lower_is_better:
+                    first, latest, best = rec["first_lowest"], rec["latest_lowest"], rec["min_lowest"]
+                else:
+                    first, latest, best = rec["first_highest"], rec["latest_highest"], rec["max_highest"]
+                rows.append(summary_record(metric, first, latest, best, age_group))
+        return summary_frame(rows)
+
+    def leaderboard(self, metric, max_age=None):
+        return self._memoized(("leaderboard", metric, max_age), lambda: self._leaderboard(metric, max_age))
+
+    def _leaderboard(self, metric, max_age):
+        lower = metric in lower_is_better
+        value_col = "Lowest" if lower else "Highest"
+
+        best = {}
+        with self._lock:
+            for (player, age), (min_avg, max_avg, last_date) in self.leaderboards.get(metric, {}).items():
+                if max_age is not None and not age <= int(max_age):
+                    continue
+                value = min_avg if lower else max_avg
+                current = best.get(player)
+                if current is None:
+                    best[player] = [value, age, last_date]
+                    continue
+                current[0] = np.fmin(current[0], value) if lower else np.fmax(current[0], value)
+                if _is_later(last_date, current[2]):
+                    current[1] = age
+                    current[2] = last_date
+
+        leaderboard = pd.DataFrame(
+            [(player, age, value) for player, (value, age, _) in best.items()],
+            columns=["full_name", "Age", value_col]
+        )
+        return leaderboard.sort_values(value_col, ascending=lower)
+
+    def _team_days(self, team, start=None, end=None):
+        # Undated entries only fall inside an unbounded window
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end is not None else None
+        for (date, metric), acc in self.team_daily.get(team, {}).items():
+            if start is not None and not date >= start:
+                continue
+            if end is not None and not date < end:
+                continue
+            yield date, metric, acc
+
+    def team_trend(self, team, metrics, start=None, end=None):
+        # Team mean of Average per (Date, Metric_Type)
+        metrics = tuple(metrics)
+        return self._memoized(
+            ("team_trend", team, metrics, start, end),
+            lambda: self._team_trend(team, metrics, start, end)
+        )
+
+    def _team_trend(self, team, metrics, start, end):
+        with self._lock:
+            rows = [
+                (date, metric, acc[0] / acc[1] if acc[1] else np.nan)
+                for date, metric, acc in self._team_days(team, start, end)
+                if metric in metrics and not pd.isna(date)
+            ]
+        trend = pd.DataFrame(rows, columns=["Date", "Metric_Type", "Average"])
+        return trend.sort_values(["Date", "Metric_Type"]).reset_index(drop=True)
+
+    def team_means(self, team, start=None, end=None):
+        # (mean age over all rows, {metric: mean Average}), undated rows included
+        return self._memoized(("team_means", team, start, end), lambda: self._team_means(team, start, end))
+
+    def _team_means(self, team, start, end):
+        age_sum = age_n = 0
+        sums = {}
+        with self._lock:
+            for _, metric, (sum_avg, n_avg, sum_age, n_age) in self._team_days(team, start, end):
+                age_sum += sum_age
+                age_n += n_age
+                if metric is None:
+                    continue
+                acc = sums.setdefault(metric, [0.0, 0])
+                acc[0] += sum_avg
+                acc[1] += n_avg
+
+        avg_age = age_sum / age_n if age_n else np.nan
+        means = {metric: (s / n if n else np.nan) for metric, (s, n) in sums.items()}
+        return avg_age, means
+
+
+# =========================
+# FRAME-BASED FALLBACK
+# =========================
+# The same reads computed straight from the store's rows, used while an
+# AggregateState is still being built or restored in the background (see
+# warmup.py), so the first rerun after a deploy doesn't wait for it.
+
+class FrameAggregates:
+    def __init__(self, store):
+        self.store = store
+
+    def results_summary(self, player, age_group):
+        return build_results_summary(self.store.scan(full_name=player), age_group)
+
+    def leaderboard(self, metric, max_age=None):
+        return build_leaderboard(self.store.scan(Metric_Type=metric), metric, max_age)
+
+    def team_trend(self, team, metrics, start=None, end=None):
+        # Undated rows have no test day to plot, so groupby leaves them out
+        rows = self.store.scan(start, end, Team=team, Metric_Type=list(metrics))
+        trend = rows.groupby(["Date", "Metric_Type"], as_index=False)["Average"].mean()
+        return trend[["Date", "Metric_Type", "Average"]].sort_values(["Date", "Metric_Type"]).reset_index(drop=True)
+
+    def team_means(self, team, start=None, end=None):
+        rows = self.store.scan(start, end, Team=team)
+        means = rows.groupby("Metric_Type")["Average"].mean()
+        return rows["Age"].mean(), means.to_dict()
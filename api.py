@@ -0,0 +1,262 @@
+import json
+import logging
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from exports import leaderboard_table
+from snapshot import MANIFEST_NAME, Snapshot, read_manifest, snapshot_dir_name
+from view_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# READ-ONLY JSON API
+# =========================
+# Serves the precomputed snapshot tables written by `python cli.py snapshot`.
+# Every response carries an ETag derived from the data version (for /version,
+# also from the snapshot build it describes), so polling clients that send
+# If-None-Match get a 304 until the next snapshot lands. The path is resolved
+# first, so unknown resources are still a 404.
+#
+#   GET /version
+#   GET /players[?team=...&age_group=...]
+#   GET /players/<name>
+#   GET /teams
+#   GET /teams/<team>
+#   GET /leaderboard/<metric>[?limit=15&max_age=12]
+#
+# Leaderboards for all ages come from the precomputed table. With max_age the
+# board is rebuilt from the snapshot's rows filtered to that age, as the
+# dashboard does, so a player's earlier tests still count after they age out.
+
+RESPONSE_CACHE_MB = int(os.environ.get("LCB_API_CACHE_MB", "32"))
+DEFAULT_LEADERBOARD_LIMIT = 15
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def frame_records(df):
+    # Round-trip through pandas' JSON writer so NaN, NaT and numpy types serialize
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def etag_for(version, manifest=None):
+    # /version passes its manifest: a --force rebuild keeps the data version
+    # but changes what /version reports
+    if manifest is not None:
+        version = (version, manifest.get("snapshot"), manifest.get("created"))
+    return f'"{snapshot_dir_name(version)}"'
+
+
+def int_param(query, name, default, minimum):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+    if value < minimum:
+        raise BadRequest(f"{name} must be at least {minimum}")
+    return value
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class SnapshotAPI:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._manifest = None
+        self._manifest_mtime = None
+        self._store = None  # rows of the current snapshot, loaded on first use
+        self.responses = LRUCache(RESPONSE_CACHE_MB * 1024 * 1024)
+
+    # ---------------------------
+    # SNAPSHOT TRACKING
+    # ---------------------------
+    def current(self):
+        # One stat() per request; the snapshot is only reopened when the
+        # manifest has been replaced
+        mtime = os.stat(os.path.join(self.root, MANIFEST_NAME)).st_mtime_ns
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                manifest = read_manifest(self.root)
+                if manifest != self._manifest:
+                    # A new version, or the same one rebuilt with --force
+                    self._snapshot = Snapshot(self.root, manifest["version"])
+                    self._store = None
+                    self.responses.clear()
+                self._manifest = manifest
+                self._manifest_mtime = mtime
+            return self._snapshot, self._manifest
+
+    def store(self, snapshot):
+        # Only the age-filtered leaderboards read the rows
+        with self._lock:
+            if self._store is None or self._store.version != snapshot.version:
+                self._store = snapshot.store()
+            return self._store
+
+    # ---------------------------
+    # ROUTES
+    # ---------------------------
+    def payload(self, path, query):
+        # Returns (etag, JSON bytes); responses are cached until the manifest
+        # changes. Raises NotFound for unknown paths.
+        snapshot, manifest = self.current()
+        key = (snapshot.version, path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        body = self.responses.get_or_build(
+            key,
+            lambda: json.dumps(self.route(snapshot, manifest, path, query)).encode("utf-8")
+        )
+        is_version = [part for part in path.split("/") if part] == ["version"]
+        return etag_for(snapshot.version, manifest if is_version else None), body
+
+    def route(self, snapshot, manifest, path, query):
+        parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+        if parts == ["version"]:
+            return manifest
+        if parts == ["players"]:
+            return self.players(snapshot, query)
+        if len(parts) == 2 and parts[0] == "players":
+            return self.player(snapshot, parts[1])
+        if parts == ["teams"]:
+            return frame_records(snapshot.table("teams"))
+        if len(parts) == 2 and parts[0] == "teams":
+            return self.team(snapshot, parts[1])
+        if len(parts) == 2 and parts[0] == "leaderboard":
+            return self.leaderboard(snapshot, parts[1], query)
+        raise NotFound(path)
+
+    def players(self, snapshot, query):
+        players = snapshot.table("players")
+        if "team" in query:
+            players = players[players["Team"].isin(query["team"])]
+        if "age_group" in query:
+            players = players[players["Age Group"].isin(query["age_group"])]
+        return frame_records(players)
+
+    def player(self, snapshot, name):
+        players = snapshot.table("players")
+        row = players[players["Player"] == name]
+        if row.empty:
+            raise NotFound(name)
+        summaries = snapshot.table("summaries")
+        summary = summaries[summaries["Player"] == name].drop(columns=["Player", "Team", "Age Group"])
+        return {**frame_records(row)[0], "summary": frame_records(summary)}
+
+    def team(self, snapshot, team):
+        teams = snapshot.table("teams")
+        row = teams[teams["Team"] == team]
+        if row.empty:
+            raise NotFound(team)
+        metrics = snapshot.table("team_metrics")
+        means = frame_records(metrics[metrics["Team"] == team])
+        return {**frame_records(row)[0], "metrics": {m["Metric"]: m["Average"] for m in means}}
+
+    def leaderboard(self, snapshot, metric, query):
+        limit = int_param(query, "limit", DEFAULT_LEADERBOARD_LIMIT, minimum=1)
+        max_age = int_param(query, "max_age", None, minimum=0)
+
+        leaderboards = snapshot.table("leaderboards")
+        board = leaderboards[leaderboards["Metric"] == metric]
+        if board.empty:
+            raise NotFound(metric)
+        if max_age is not None:
+            metric_df = self.store(snapshot).scan(Metric_Type=metric)
+            board = leaderboard_table(metric_df, metric, max_age)
+
+        head = board.head(limit)
+        head = head.assign(Rank=range(1, len(head) + 1))
+        return frame_records(head.drop(columns=["Metric"]))
+
+
+# =========================
+# HTTP LAYER
+# =========================
+class APIRequestHandler(BaseHTTPRequestHandler):
+    api = None  # set by make_server
+    server_version = "LCBTrainingAPI/1.0"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        try:
+            # Resolved (or served from the response cache) before the tag is
+            # compared, so a 304 is only sent for resources that exist
+            etag, body = self.api.payload(url.path, parse_qs(url.query))
+        except NotFound:
+            return self._send_error(HTTPStatus.NOT_FOUND, "not found", send_body)
+        except BadRequest as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+        except FileNotFoundError:
+            return self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "no snapshot available", send_body)
+        except Exception:
+            logger.exception("Failed to serve %s", self.path)
+            return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error", send_body)
+
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message, send_body):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(root, host="127.0.0.1", port=8502):
+    handler = type("BoundAPIRequestHandler", (APIRequestHandler,), {"api": SnapshotAPI(root)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(root, host="127.0.0.1", port=8502):
+    server = make_server(root, host, port)
+    logger.info("Serving snapshot %s on http://%s:%d", root, host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,28 @@
+import os
+import threading
+from contextlib import asynccontextmanager
+
+import streamlit as st
+
+# =========================
+# SERVER ENTRY POINT
+# =========================
+# `streamlit run app.py` serves dashboard.py and, as soon as the server is up,
+# loads the data and starts the warm-up (see loaders.load_at_startup) on a
+# background thread. The first session then finds the data loaded and the
+# aggregates built or building, instead of paying for them itself. Sessions
+# that arrive while it runs wait on the same cache entries rather than
+# loading the data a second time.
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+
+
+@asynccontextmanager
+async def warm_on_startup(app):
+    from loaders import load_at_startup
+
+    threading.Thread(target=load_at_startup, name="lcb-startup", daemon=True).start()
+    yield
+
+
+app = st.App(DASHBOARD, lifespan=warm_on_startup)
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from metrics import baseball_metrics, speed_metrics
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# TREND FIGURES
+# =========================
+CHART_GROUPS = {
+    "strength": (baseball_metrics, "Highest", "Strength Performance"),
+    "speed": (speed_metrics, "Lowest", "Speed & Agility Performance"),
+}
+
+def trend_figure(df, y, title, height=350):
+    import plotly.express as px
+
+    fig = px.line(
+        df.sort_values("Date"),
+        x="Date", y=y, color="Metric_Type",
+        markers=True,
+        title=title
+    )
+    fig.update_layout(height=height, legend_title_text="Metric")
+    return fig
+
+def group_figure(player_df, group):
+    metrics, y, title = CHART_GROUPS[group]
+    group_df = player_df[player_df["Metric_Type"].isin(metrics)]
+    if group_df.empty:
+        return None
+    return trend_figure(group_df, y, title)
+
+
+# =========================
+# PERSISTENT KALEIDO RENDERER
+# =========================
+# One headless browser is started on first use and kept warm for the life of
+# the process. Figures are rendered concurrently across `workers` browser tabs
+# and the PNGs are cached by (player, metric group, data version) plus the date
+# window the player's rows were taken from. The dashboard passes the player's
+# own version (store.player_version), so PNGs survive unrelated refreshes.
+#
+# If the browser can't be started (e.g. Chrome isn't installed), the failure
+# is remembered and reports go straight to the no-charts fallback until
+# START_RETRY_SECONDS have passed.
+
+IMAGE_WIDTH = 900
+IMAGE_HEIGHT = 420
+IMAGE_SCALE = 1.5
+RENDER_TIMEOUT = 60
+START_RETRY_SECONDS = 5 * 60
+
+
+class RendererUnavailable(RuntimeError):
+    pass
+
+
+def _find_chrome():
+    # choreographer starts its worker threads before looking for Chrome and
+    # can't stop them when it isn't found, so look first
+    from choreographer.browsers import Chromium
+
+    path = Chromium.find_browser(skip_local=False)
+    if not path:
+        raise RendererUnavailable("Chrome is not installed (run `kaleido_get_chrome`)")
+    return path
+
+
+class ChartRenderer:
+    def __init__(self, workers=2, cache_size=256):
+        self.workers = workers
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._loop = None
+        self._kaleido = None
+        self._failed_at = None
+        self._failure = None
+        self.hits = 0
+        self.misses = 0
+
+    # ---------------------------
+    # BROWSER LIFECYCLE
+    # ---------------------------
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._kaleido is not None:
+                return
+            if self._failed_at is not None and time.monotonic() - self._failed_at < START_RETRY_SECONDS:
+                raise RendererUnavailable(self._failure)
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="kaleido-renderer", daemon=True)
+            thread.start()
+
+            k = None
+            try:
+                import kaleido
+
+                _find_chrome()
+                k = kaleido.Kaleido(n=self.workers)
+                asyncio.run_coroutine_threadsafe(k.open(), loop).result(RENDER_TIMEOUT)
+            except Exception as e:
+                if k is not None:
+                    try:
+                        asyncio.run_coroutine_threadsafe(k.close(), loop).result(RENDER_TIMEOUT)
+                    except Exception:
+                        logger.debug("Closing the half-started renderer failed", exc_info=True)
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(RENDER_TIMEOUT)
+                loop.close()
+                self._failed_at = time.monotonic()
+                self._failure = f"Chart renderer failed to start: {e}"
+                logger.warning("%s; reports skip charts for the next %ds", self._failure, START_RETRY_SECONDS)
+                raise RendererUnavailable(self._failure) from e
+
+            self._loop = loop
+            self._kaleido = k
+            self._failed_at = None
+            self._failure = None
+
+    def close(self):
+        with self._start_lock:
+            if self._kaleido is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._kaleido.close(), self._loop).result(RENDER_TIMEOUT)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._kaleido = None
+            self._loop = None
+
+    # ---------------------------
+    # CACHE
+    # ---------------------------
+    def _cache_get(self, key):
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+            return None
+
+    def _cache_put(self, key, png):
+        with self._cache_lock:
+            self._cache[key] = png
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def discard(self, predicate):
+        with self._cache_lock:
+            stale = [key for key in self._cache if predicate(key)]
+            for key in stale:
+                del self._cache[key]
+            return len(stale)
+
+    # ---------------------------
+    # RENDERING
+    # ---------------------------
+    def render_many(self, figures):
+        # figures: {cache_key: zero-arg figure builder}; returns {cache_key: png bytes}
+        # Builders only run for cache misses, once the browser is up.
+        images = {}
+        missing = []
+        for key in figures:
+            png = self._cache_get(key)
+            if png is not None:
+                images[key] = png
+            else:
+                missing.append(key)
+
+        if not missing:
+            return images
+
+        self._ensure_started()
+        pending = {key: figures[key]() for key in missing}
+        opts = {"format": "png", "width": IMAGE_WIDTH, "height": IMAGE_HEIGHT, "scale": IMAGE_SCALE}
+        futures = {
+            key: asyncio.run_coroutine_threadsafe(self._kaleido.calc_fig(fig, opts=opts), self._loop)
+            for key, fig in pending.items()
+        }
+        for key, future in futures.items():
+            png = future.result(RENDER_TIMEOUT)
+            self._cache_put(key, png)
+            images[key] = png
+
+        return images
+
+    def render_player_charts(self, player_name, player_df, data_version, window=None):
+        # Returns the PNGs for every chart group the player has data for
+        figures = {
+            (player_name, group, data_version, window): partial(group_figure, player_df, group)
+            for group, (metrics, _, _) in CHART_GROUPS.items()
+            if player_df["Metric_Type"].isin(metrics).any()
+        }
+
+        try:
+            images = self.render_many(figures)
+        except RendererUnavailable:
+            return []
+        except Exception:
+            logger.exception("Chart rendering failed; building report without charts")
+            return []
+        return [images[key] for key in figures]
+
+    def stats(self):
+        with self._cache_lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": sum(len(png) for png in self._cache.values()),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_renderer():
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
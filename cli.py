@@ -0,0 +1,217 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger("lcb")
+
+# =========================
+# HEADLESS BATCH ENTRY POINT
+# =========================
+# Runs the dashboard's compute path without Streamlit, e.g. nightly from cron:
+#
+#   python cli.py snapshot --out /srv/lcb/snapshot --reports
+#   python cli.py serve --snapshot /srv/lcb/snapshot --port 8502
+#
+# The dashboard then reads the snapshot instead of Google Sheets when started
+# with LCB_SNAPSHOT_DIR=/srv/lcb/snapshot.
+
+DEFAULT_SECRETS = os.path.join(".streamlit", "secrets.toml")
+
+
+# =========================
+# DATA SOURCES
+# =========================
+def load_credentials(credentials=None, secrets=DEFAULT_SECRETS):
+    # A service-account JSON file, or the same [gcp_service_account] table the
+    # dashboard reads from Streamlit secrets
+    if credentials:
+        with open(credentials, encoding="utf-8") as f:
+            return json.load(f)
+
+    import tomllib
+
+    with open(secrets, "rb") as f:
+        return tomllib.load(f)["gcp_service_account"]
+
+
+def load_frame(args):
+    # Returns (df, data_version)
+    import pandas as pd
+    from data_store import frame_version
+    from sheets import SheetSource, clean_frame
+
+    if args.csv:
+        df = clean_frame(pd.read_csv(args.csv).to_dict("records"))
+        return df, "file:" + frame_version(df)
+
+    source = SheetSource(load_credentials(args.credentials, args.secrets))
+    version = source.data_version()
+    return source.fetch_frame(), version
+
+
+# =========================
+# PARALLEL REPORTS
+# =========================
+# reports/versions.json records the content hash of each player's rows (see
+# dirty.py). A player whose rows are unchanged since the previous snapshot gets
+# that snapshot's PDF linked in instead of a fresh render.
+REPORT_VERSIONS = "versions.json"
+
+
+def read_report_versions(reports_dir, charts):
+    # {player: version} of the reports in reports_dir, if rendered the same way
+    try:
+        with open(os.path.join(reports_dir, REPORT_VERSIONS), encoding="utf-8") as f:
+            recorded = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return recorded["players"] if recorded.get("charts") == charts else {}
+
+
+def reuse_report(previous_dir, reports_dir, player_name):
+    from snapshot import report_file_name
+
+    source = os.path.join(previous_dir, report_file_name(player_name))
+    target = os.path.join(reports_dir, report_file_name(player_name))
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def render_report(reports_dir, player_name, player_df, age_group, team, data_version, charts):
+    # Runs in a worker process; each worker keeps its own warm renderer
+    from reports import create_player_summary_pdf
+    from snapshot import report_file_name
+
+    chart_images = None
+    if charts:
+        from charts import get_renderer
+        chart_images = get_renderer().render_player_charts(player_name, player_df, data_version)
+
+    pdf_path = create_player_summary_pdf(player_name, player_df, age_group, team, chart_images=chart_images)
+    shutil.move(pdf_path, os.path.join(reports_dir, report_file_name(player_name)))
+    return player_name
+
+
+def report_writer(df, data_version, workers, charts, previous_dir=None):
+    from data_store import group_versions
+    from metrics import player_profile
+
+    versions = group_versions(df, "full_name")
+    previous = read_report_versions(previous_dir, charts) if previous_dir else {}
+
+    def write_reports(reports_dir):
+        jobs = []
+        written = {}
+        for player_name, player_df in df.groupby("full_name", sort=True):
+            if previous.get(player_name) == versions[player_name]:
+                try:
+                    reuse_report(previous_dir, reports_dir, player_name)
+                    written[player_name] = versions[player_name]
+                    continue
+                except OSError:
+                    logger.warning("Could not reuse the report for %s; rendering it again", player_name)
+            _, team, age_group = player_profile(player_df)
+            jobs.append((reports_dir, player_name, player_df, age_group, team, versions[player_name], charts))
+        reused = len(written)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_report, *job) for job in jobs]
+            for future in futures:
+                try:
+                    player_name = future.result()
+                    written[player_name] = versions[player_name]
+                except Exception:
+                    logger.exception("Report failed")
+
+        with open(os.path.join(reports_dir, REPORT_VERSIONS), "w", encoding="utf-8") as f:
+            json.dump({"charts": charts, "players": written}, f)
+        logger.info(
+            "Rendered %d/%d player reports, reused %d unchanged",
+            len(written) - reused, len(jobs), reused
+        )
+        return len(written)
+
+    return write_reports
+
+
+# =========================
+# COMMANDS
+# =========================
+def cmd_snapshot(args):
+    from snapshot import read_manifest, write_snapshot
+
+    started = time.perf_counter()
+    df, version = load_frame(args)
+    logger.info("Loaded %d rows (version %s)", len(df), version)
+
+    try:
+        manifest = read_manifest(args.out)
+    except (OSError, ValueError):
+        manifest = {}
+    if not args.force and manifest.get("version") == version:
+        logger.info("Snapshot already at version %s; nothing to do", version)
+        return 0
+
+    write_reports = None
+    if args.reports:
+        previous_dir = os.path.join(args.out, manifest["snapshot"], "reports") if "snapshot" in manifest else None
+        write_reports = report_writer(df, version, args.workers, args.charts, previous_dir)
+    path = write_snapshot(args.out, df, version, write_reports=write_reports)
+    logger.info("Wrote snapshot %s in %.1fs", path, time.perf_counter() - started)
+    return 0
+
+
+def cmd_serve(args):
+    from api import serve
+
+    serve(args.snapshot, args.host, args.port)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lcb", description="LCB Training batch tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snap = commands.add_parser("snapshot", help="precompute tables (and optionally reports) into a snapshot")
+    snap.add_argument("--out", default=os.environ.get("LCB_SNAPSHOT_DIR", "snapshot"),
+                      help="snapshot root directory (default: $LCB_SNAPSHOT_DIR or ./snapshot)")
+    source = snap.add_mutually_exclusive_group()
+    source.add_argument("--credentials", help="service-account JSON file")
+    source.add_argument("--csv", help="read rows from a CSV export instead of Google Sheets")
+    snap.add_argument("--secrets", default=DEFAULT_SECRETS,
+                      help=f"Streamlit secrets file with [gcp_service_account] (default: {DEFAULT_SECRETS})")
+    snap.add_argument("--reports", action="store_true", help="render every player's PDF report")
+    snap.add_argument("--charts", action="store_true", help="embed trend charts in the reports")
+    snap.add_argument("--workers", type=int, default=os.cpu_count(), help="report worker processes")
+    snap.add_argument("--force", action="store_true", help="rebuild even if the data version is unchanged")
+    snap.set_defaults(func=cmd_snapshot)
+
+    api = commands.add_parser("serve", help="serve a snapshot as a read-only JSON API")
+    api.add_argument("--snapshot", default=os.environ.get("LCB_SNAPSHOT_DIR", "snapshot"),
+                     help="snapshot root directory (default: $LCB_SNAPSHOT_DIR or ./snapshot)")
+    api.add_argument("--host", default="127.0.0.1")
+    api.add_argument("--port", type=int, default=8502)
+    api.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+import base64
+import html
+from functools import lru_cache
+from io import BytesIO
+
+import streamlit as st
+
+# =========================
+# PAGE STYLES
+# =========================
+# All dashboard CSS lives in one stylesheet that is built once per process and
+# sent as a single element per run. Streamlit drops any element a rerun does not
+# redraw, so the stylesheet still has to be emitted each run, but it is one
+# small delta instead of a style block per section and per card.
+
+PAGE_CSS = """
+/* HEADER WRAPPER */
+.header-wrapper {
+    background-color: #000000;
+    padding: 18px;
+    border-radius: 12px;
+    margin-bottom: 30px;
+    display: flex;
+    align-items: center;
+    gap: 20px;
+}
+
+/* LOGO */
+.header-logo {
+    width: 120px;
+    height: auto;
+    margin-right: 20px;
+    border-radius: 12px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+}
+
+/* HEADER TEXT */
+.header-text h1 {
+    color: #FFFFFF;
+    margin: 0;
+    font-size: 36px;
+    font-weight: 700;
+}
+
+.header-text p {
+    color: #FFFFFF;
+    margin: 2px 0;
+    font-size: 16px;
+}
+
+/* SLOGAN */
+.header-text .slogan {
+    color: #FFFFFF;
+    margin-top: 5px;
+    font-size: 14px;
+    font-style: italic;
+    max-width: 600px;
+}
+
+/* CARD */
+.card {
+    padding: 20px;
+    background-color: #FFFFFF;
+    border-radius: 14px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.18);
+    margin-bottom: 25px;
+}
+
+/* KPI TILE */
+.kpi {
+    padding: 14px;
+    background-color: #F5F5F5;
+    border-radius: 12px;
+    text-align: center;
+    box-shadow: 0 1px 5px rgba(0,0,0,0.12);
+}
+
+.kpi h4 {
+    margin: 4px 0 6px 0;
+    font-size: 14px;
+    color: #444;
+}
+
+.kpi b {
+    font-size: 18px;
+    color: #000;
+}
+
+/* KPI GRID */
+.kpi-grid {
+    display: grid;
+    grid-template-columns: repeat(var(--kpi-cols, 4), minmax(0, 1fr));
+    gap: 16px;
+    margin-bottom: 16px;
+}
+
+@media (max-width: 640px) {
+    .kpi-grid {
+        grid-template-columns: repeat(min(var(--kpi-cols, 4), 2), minmax(0, 1fr));
+    }
+}
+
+/* METRIC CARD */
+.kpi-metric {
+    padding: 20px;
+}
+
+.kpi-metric h3 {
+    margin: 0 0 10px 0;
+    font-size: 20px;
+    color: blue;
+}
+
+.kpi-metric p {
+    margin: 4px 0;
+    font-size: 18px;
+    color: blue;
+}
+
+.kpi-metric b {
+    font-size: inherit;
+    color: inherit;
+}
+
+.kpi-metric .growth {
+    margin: 8px 0 0 0;
+    font-size: 20px;
+    font-weight: 700;
+}
+
+.growth-up { color: #00B050; }
+.growth-down { color: #FF0000; }
+.growth-flat { color: #000000; }
+"""
+
+
+def inject_styles():
+    st.markdown(f"<style>{PAGE_CSS}</style>", unsafe_allow_html=True)
+
+
+# =========================
+# HEADER
+# =========================
+HEADER_LOGO_PX = 240  # shown at 120px; 2x for high-density screens
+
+
+@lru_cache(maxsize=1)
+def header_logo_base64(path):
+    # Downscaled once per process so each rerun ships a small image, not the full PNG
+    from PIL import Image
+
+    img = Image.open(path)
+    img.thumbnail((HEADER_LOGO_PX, HEADER_LOGO_PX))
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def render_header(logo_path):
+    logo_b64 = header_logo_base64(logo_path)
+    st.markdown(
+        f"""
+        <div class="header-wrapper">
+            <img src="data:image/png;base64,{logo_b64}" class="header-logo">
+            <div class="header-text">
+                <h1>LCB Training Performance Dashboard</h1>
+                <p>Player Development • Strength • Speed • Confidence</p>
+                <p class="slogan">Elite Player Development Training for Teams and Players — <b>Helping Athletes Build Strength, Skill, and Confidence On and Off the Field</b></p>
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+# =========================
+# KPI CARDS
+# =========================
+def kpi_card(title, value):
+    return f"<div class='kpi'><h4>{html.escape(str(title))}</h4><b>{html.escape(str(value))}</b></div>"
+
+
+def metric_card(metric, first, best, growth):
+    # Determine arrow and color
+    if growth > 0:
+        growth_class, arrow = "growth-up", "▲"
+    elif growth < 0:
+        growth_class, arrow = "growth-down", "▼"
+    else:
+        growth_class, arrow = "growth-flat", ""
+
+    return (
+        "<div class='kpi kpi-metric'>"
+        f"<h3>{html.escape(str(metric))}</h3>"
+        f"<p><b>First:</b> {first:.2f}</p>"
+        f"<p><b>Best:</b> {best:.2f}</p>"
+        f"<p class='growth {growth_class}'>{arrow} {growth:.2f}</p>"
+        "</div>"
+    )
+
+
+def render_kpi_grid(cards, columns=4):
+    # Every card in a section goes out as one markdown element
+    if not cards:
+        return
+    st.markdown(
+        f"<div class='kpi-grid' style='--kpi-cols:{columns}'>{''.join(cards)}</div>",
+        unsafe_allow_html=True
+    )
+
+
+# =========================
+# TABLES
+# =========================
+# Tables go through st.dataframe's column config rather than a pandas Styler, so
+# formatting is done by the frontend and nothing runs per row in Python.
+def number_columns(*cols, fmt="%.2f"):
+    return {col: st.column_config.NumberColumn(col, format=fmt) for col in cols}
+
+
+def render_table(df, number_cols=(), **column_config):
+    config = number_columns(*[c for c in number_cols if c in df.columns])
+    config.update(column_config)
+    st.dataframe(df, column_config=config, width="stretch")
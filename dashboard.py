@@ -1,635 +1,123 @@
+import os
+
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 import streamlit as st
 import plotly.express as px
-import plotly.graph_objects as go
-from PIL import Image
-import base64
-from io import BytesIO
-from reportlab.lib.pagesizes import LETTER
-from reportlab.pdfgen import canvas
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import Table, TableStyle, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER
-import tempfile
-
-# =========================
-# LOAD GOOGLE SHEETS
-# =========================
-@st.cache_data
-def load_data():
-    SCOPES = [
-        "https://www.googleapis.com/auth/spreadsheets.readonly",
-        "https://www.googleapis.com/auth/drive.readonly"
-    ]
-    creds_dict = st.secrets["gcp_service_account"]
-    creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-    client = gspread.authorize(creds)
-
-    spreadsheet = client.open("LCBTraining Data")
-    worksheet = spreadsheet.worksheet("Data")
-    data = worksheet.get_all_records()
-    df = pd.DataFrame(data)
-
-    numeric_cols = ["Attempt_1","Attempt_2","Attempt_3","Last_Attempt","Average","Highest","Lowest"]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-
-    df["full_name"] = df["Player_name_first"].fillna("") + " " + df["Player_name_last"].fillna("")
-    return df
-
-df = load_data()
-
-# =========================
-# CONFIG
-# =========================
-lower_is_better = {"10 yard sprint", "Pro Agility", "Home to 1B sprint"}
-
-targets = {
-    "8U": {
-        "Bench": 45, "Squat": 70, "Pull Ups": 2, "Wall Sit": 30, "Plank": 30, "Push Ups": 5,
-        "10 yard sprint": 2.8, "Pro Agility": 5.8, "Home to 1B sprint": 6.0,
-        "Arm Speed Pitch": 30, "Arm Speed Reg": 35, "BES Flip": 50, "BES Tee": 45, "Broad Jump": 5
-    },
-    "10U": {
-        "Bench": 65, "Squat": 90, "Pull Ups": 4, "Wall Sit": 60, "Plank": 45, "Push Ups": 10,
-        "10 yard sprint": 2.3, "Pro Agility": 5.2, "Home to 1B sprint": 5.2,
-        "Arm Speed Pitch": 40, "Arm Speed Reg": 45, "BES Flip": 60, "BES Tee": 55, "Broad Jump": 6
-    },
-    "12U": {
-        "Bench": 90, "Squat": 120, "Pull Ups": 6, "Wall Sit": 90, "Plank": 60, "Push Ups": 15,
-        "10 yard sprint": 2.0, "Pro Agility": 4.9, "Home to 1B sprint": 5.0,
-        "Arm Speed Pitch": 50, "Arm Speed Reg": 55, "BES Flip": 65, "BES Tee": 60, "Broad Jump": 7
-    },
-    "14U": {
-        "Bench": 120, "Squat": 135, "Pull Ups": 8, "Wall Sit": 120, "Plank": 90, "Push Ups": 20,
-        "10 yard sprint": 1.9, "Pro Agility": 4.8, "Home to 1B sprint": 4.8,
-        "Arm Speed Pitch": 60, "Arm Speed Reg": 65, "BES Flip": 75, "BES Tee": 70, "Broad Jump": 7.5
-    },
-    "16U": {
-        "Bench": 135, "Squat": 180, "Pull Ups": 10, "Wall Sit": 180, "Plank": 120, "Push Ups": 25,
-        "10 yard sprint": 1.7, "Pro Agility": 4.7, "Home to 1B sprint": 4.3,
-        "Arm Speed Pitch": 70, "Arm Speed Reg": 75, "BES Flip": 90, "BES Tee": 80, "Broad Jump": 9
-    }
-}
-
-def get_age_group(age):
-    if age <= 8: return "8U"
-    elif age <= 10: return "10U"
-    elif age <= 12: return "12U"
-    elif age <= 14: return "14U"
-    return "16U"
-
-# =========================
-# Player Hitting Grades
-# =========================
-def get_hitting_grade(player_df, age_group):
-    goals = targets.get(age_group, {})
-
-    if "BES Tee" not in goals:
-        return "—", None
-
-    goal = goals["BES Tee"]
-
-    if "BES Tee" not in player_df["Metric_Type"].values:
-        return "—", None
-
-    best = (
-        player_df[player_df["Metric_Type"] == "BES Tee"]["Highest"].max()
-    )
-
-    diff = goal - best  # how far from goal
-
-    # Grade logic
-    if diff <= 8:
-        grade = "A"
-    elif diff <= 12:
-        grade = "B"
-    elif diff <= 15:
-        grade = "C"
-    else:
-        grade = "D"
-
-    # mph to A (0 if already an A)
-    mph_to_a = max(0, diff)
-
-    return grade, round(mph_to_a, 1)
+from functools import partial
+from data_store import season_bounds
+from metrics import (
+    baseball_metrics, speed_metrics, AGE_GROUPS,
+    SUMMARY_NUMERIC_COLS, build_top_performers
+)
+import exports
+from jobs import get_job_queue, submit_player_report
+from view_cache import get_player_views
+from aggregates import FrameAggregates
+from loaders import (
+    SNAPSHOT_DIR, get_data_version, get_dirty_tracker, get_player_index, get_snapshot,
+    get_view_counter, load
+)
+import memory
+from components import inject_styles, render_header, kpi_card, metric_card, render_kpi_grid, render_table
 
 # =========================
-# Player Speed Grade
+# LOAD DATA
 # =========================
-def get_speed_grade(player_df, age_group):
-    speed_metrics = ["10 yard sprint", "Pro Agility", "Home to 1B sprint"]
-    goals = targets.get(age_group, {})
-    diffs = []
-
-    for metric in speed_metrics:
-        if metric not in player_df["Metric_Type"].values:
-            continue
-        if metric not in goals:
-            continue
-
-        best = (
-            player_df[player_df["Metric_Type"] == metric]["Lowest"].min()
-        )
-
-        diff = best - goals[metric]  # positive = slower
-        diffs.append(diff)
+# The data, store, fingerprints and running aggregates are process-wide caches
+# (see loaders.py). Served through app.py they're loaded and the warm-up is
+# started when the server starts, so the first session finds them ready.
+# Under a plain `streamlit run dashboard.py` the first rerun does this.
 
-    if not diffs:
-        return "—", None
+# Per-rerun memory ledger (see memory.py; full view with ?admin=memory)
+memory.setup()
+ledger = memory.MemoryLedger()
 
-    avg_diff = sum(diffs) / len(diffs)
-
-    # Grade logic (seconds from goal)
-    if avg_diff <= 0.10:
-        grade = "A"
-    elif avg_diff <= 0.15:
-        grade = "B"
-    elif avg_diff <= 0.25:
-        grade = "C"
-    else:
-        grade = "D"
+loaded = load(get_data_version())
+data_version, df, store, options = loaded.data_version, loaded.df, loaded.store, loaded.options
+changes, aggregate_state, warmup = loaded.changes, loaded.aggregate_state, loaded.warmup
 
-    sec_to_a = max(0, avg_diff)
-
-    return grade, round(sec_to_a, 2)
+# Until the warm-up has built the aggregates, reads come straight from the rows
+aggregate_ready = aggregate_state.version == data_version
+aggregates = aggregate_state if aggregate_ready else FrameAggregates(store)
 
 # =========================
-# Progress Bar
+# GLOBAL STYLE + HEADER WITH LOGO + SLOGAN
 # =========================
-def draw_progress_bar(c, x, y, width, height, progress, fill_color):
-    progress = max(0, min(1, progress))
-
-    # Outline
-    c.setStrokeColor(colors.black)
-    c.setLineWidth(0.5)
-    c.rect(x, y, width, height, stroke=1, fill=0)
-
-    # Fill
-    c.setFillColor(fill_color)
-    c.rect(x, y, width * progress, height, stroke=0, fill=1)
-
-def hitting_progress(mph_to_a):
-    MAX_MPH = 15
-    if mph_to_a is None:
-        return 0
-    return 1 - min(mph_to_a / MAX_MPH, 1)
-
-
-def speed_progress(sec_to_a):
-    MAX_SEC = 0.30
-    if sec_to_a is None:
-        return 0
-    return 1 - min(sec_to_a / MAX_SEC, 1)
-
-def grade_color(grade):
-    return {
-        "A": colors.green,
-        "B": colors.darkgreen,
-        "C": colors.orange,
-        "D": colors.red
-    }.get(grade, colors.black)
+inject_styles()
 
+try:
+    render_header("lcb training logo.png")
+except:
+    st.warning("Logo not found — make sure 'lcb training logo.png' is present.")
 
 # =========================
-# PDF Summary
+# DATE RANGE CONTROL
 # =========================
-
-CARD_METRICS = [
-    "10 yard sprint",
-    "Pro Agility",
-    "BES Tee",
-    "BES Flip",
-    "Arm Speed Pitch",
-    "Arm Speed Reg"
-]
-
-
-def draw_scorecard(c, x, y, w, h, metric, first, best, goal, status, growth, trend_up):
-    # Card background
-    c.setFillColor(colors.whitesmoke)
-    c.roundRect(x, y, w, h, 10, fill=1)
-
-    # Border
-    c.setStrokeColor(colors.grey)
-    c.roundRect(x, y, w, h, 10, fill=0)
-
-    # Metric title
-    c.setFont("Helvetica-Bold", 11)
-    c.setFillColor(colors.black)
-    c.drawString(x + 10, y + h - 20, metric)
-
-    # First value
-    c.setFont("Helvetica", 10)
-    c.drawString(x + 10, y + h - 40, f"First: {first:.2f}")
-
-    # Best value
-    c.setFont("Helvetica", 10)
-    c.drawString(x + 10, y + h - 58, f"Best: {best:.2f}")
-
-    # Goal
-    goal_text = f"{goal:.2f}" if goal is not None else "—"
-    c.drawString(x + 10, y + h - 76, f"Goal: {goal_text}")
-
-    # Status
-    status_color = colors.green if status == "Goal Met" else colors.red
-    c.setFillColor(status_color)
-    c.drawString(x + 10, y + h - 94, f"Status: {status}")
-
-    # Trend arrow
-    sign = "+" if growth > 0 else ""
-    arrow = f"{sign}{growth:.2f} ▲" if trend_up else f"{growth:.2f} ▼"
-    arrow_color = colors.green if trend_up else colors.red
-    c.setFillColor(arrow_color)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawRightString(x + w - 10, y + 15, arrow)
-
-
-def create_player_summary_pdf(player_name, player_df, age_group, team, coach_notes=""):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    c = canvas.Canvas(temp_file.name, pagesize=LETTER)
-    width, height = LETTER
-
-    # ---- LOGO ----
-    logo_path = "lcb training logo.png"
-    c.drawImage(logo_path, 40, height - 90, width=70, height=70, mask="auto")
-
-    # ---- TITLE ----
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(160, height - 55, "LCB Training Performance Summary")
-
-    # ---- PLAYER PROFILE BOX ----
-    box_y = height - 192   # moved DOWN
-    box_h = 90  # shorter height
-    
-    c.setFillColor(colors.whitesmoke)
-    c.rect(40, box_y, 520, box_h, stroke=0, fill=1)
-    
-    # Column X positions
-    left_x = 50
-    mid_x = 230
-    right_x = 370
-    top_y = box_y + box_h - 18
-    line_gap = 18
-    
-    # ======================
-    # LEFT: PLAYER INFO
-    # ======================
-    c.setFont("Helvetica-Bold", 14)
-    c.setFillColor(colors.black)
-    c.drawString(left_x, top_y, player_name)
-    
-    c.setFont("Helvetica", 10.5)
-    c.drawString(left_x, top_y - line_gap, f"Team: {team}")
-    c.drawString(left_x, top_y - 2 * line_gap, f"Age Group: {age_group}")
-    
-    # Divider
-    c.setStrokeColor(colors.lightgrey)
-    c.line(mid_x - 15, box_y + 8, mid_x - 15, box_y + box_h - 8)
-    
-    # ======================
-    # MIDDLE: GRADES
-    # ======================
-    hit_grade, mph_to_a = get_hitting_grade(player_df, age_group)
-    spd_grade, sec_to_a = get_speed_grade(player_df, age_group)
-    
-    c.setFont("Helvetica-Bold", 12)
-    c.setFillColor(colors.black)
-    c.drawString(mid_x, top_y, "Grades")
-    
-    grade_offset = 26  # extra spacing under "Grades"
-    
-    # Hitting
-    c.setFont("Helvetica-Bold", 14)
-    c.setFillColor(grade_color(hit_grade))
-    c.drawString(mid_x, top_y - grade_offset, f"Hitting: {hit_grade}")
-    
-    # Speed
-    c.setFillColor(grade_color(spd_grade))
-    c.drawString(mid_x, top_y - grade_offset - line_gap, f"Speed: {spd_grade}")
-    
-    # Divider
-    c.setStrokeColor(colors.lightgrey)
-    c.line(right_x - 15, box_y + 8, right_x - 15, box_y + box_h - 8)
-    
-    # ======================
-    # RIGHT: PROGRESS BARS
-    # ======================
-    c.setFont("Helvetica-Bold", 12)
-    c.setFillColor(colors.black)
-    c.drawString(right_x, top_y, "Road to A")
-    
-    # Hitting progress
-    c.setFont("Helvetica", 10)
-    c.drawString(
-        right_x,
-        top_y - 20,
-        f"Hitting: {mph_to_a} mph" if mph_to_a is not None else "Hitting: —"
-    )
-    
-    draw_progress_bar(
-        c,
-        right_x,
-        top_y - 20 - 12,
-        width=130,
-        height=8,
-        progress=hitting_progress(mph_to_a),
-        fill_color=grade_color(hit_grade)
-    )
-    
-    # Speed progress
-    c.drawString(
-        right_x,
-        top_y - 20 - line_gap - 12,
-        f"Speed: {sec_to_a} sec" if sec_to_a is not None else "Speed: —"
-    )
-    
-    draw_progress_bar(
-        c,
-        right_x,
-        top_y - 20 - line_gap - 24,
-        width=130,
-        height=8,
-        progress=speed_progress(sec_to_a),
-        fill_color=grade_color(spd_grade)
-    )
-    
-    # ======================
-    # SCORECARDS (MOVED DOWN)
-    # ======================
-    card_width = 250
-    card_height = 110
-    start_x = 40
-    start_y = height - 310   # moved DOWN to avoid overlap
-    gap_x = 20
-    gap_y = 20
-    
-    col = 0
-    row = 0
-
-    for metric in CARD_METRICS:
-        mdf = player_df[player_df["Metric_Type"] == metric]
-        if mdf.empty:
-            continue
-
-        # First & Best values
-        if metric in lower_is_better:
-            best = mdf["Lowest"].min()
-            first = mdf.sort_values("Date")["Lowest"].iloc[0]
-            growth = first - best   # improvement if positive
-            trend_up = growth > 0
-            status = "Goal Met" if targets.get(age_group, {}).get(metric) and best <= targets[age_group][metric] else "Goal Not Met - Keep Working"
-        else:
-            best = mdf["Highest"].max()
-            first = mdf.sort_values("Date")["Highest"].iloc[0]
-            growth = best - first   # improvement if positive
-            trend_up = growth > 0
-            status = "Goal Met" if targets.get(age_group, {}).get(metric) and best >= targets[age_group][metric] else "Goal Not Met - Keep Working"
-
-        goal = targets.get(age_group, {}).get(metric)
-
-        x = start_x + col * (card_width + gap_x)
-        y = start_y - row * (card_height + gap_y)
-
-        draw_scorecard(
-            c,
-            x=x,
-            y=y,
-            w=card_width,
-            h=card_height,
-            metric=metric,
-            first=first,
-            best=best,
-            goal=goal,
-            status=status,
-            growth=growth,
-            trend_up=trend_up
+# Only the season/month partitions inside the chosen window are scanned. The
+# default stays "All Seasons", i.e. every row including undated ones.
+def date_range_control(key):
+    first, last = store.date_bounds()
+    if first is None:
+        return None, None
+
+    seasons = store.seasons()[::-1]
+    options = ["All Seasons"] + [f"{season} Season" for season in seasons] + ["Custom Range"]
+    choice = st.selectbox("Date Range", options, key=f"{key}_range")
+
+    if choice == "All Seasons":
+        return None, None
+    if choice == "Custom Range":
+        picked = st.date_input(
+            "Custom Range",
+            value=(first.date(), last.date()),
+            min_value=first.date(),
+            max_value=last.date(),
+            key=f"{key}_custom"
         )
+        if len(picked) != 2:
+            return None, None
+        return pd.Timestamp(picked[0]), pd.Timestamp(picked[1])
+    return season_bounds(int(choice.split()[0]))
 
-        col += 1
-        if col > 1:
-            col = 0
-            row += 1
-
-    # ---- COACH NOTES BOX ----
-    box_x = 40
-    box_y = 120
-    box_width = 520
-    box_height = 90
-    
-    # Draw box with light background
-    c.setFillColor(colors.whitesmoke)
-    c.rect(box_x, box_y, box_width, box_height, stroke=1, fill=1)
-    
-    # Draw header
-    c.setFont("Helvetica-Bold", 12)
-    c.setFillColor(colors.black)
-    c.drawString(box_x + 8, box_y + box_height - 20, "Coach Broc Notes:")
-    
-    # Add wrapped notes inside the box
-    if coach_notes:
-        from reportlab.lib.utils import simpleSplit
-    
-        c.setFont("Helvetica", 12)
-        c.setFillColor(colors.black)
-    
-        # Wrap text to fit inside box width minus some padding
-        wrapped_lines = simpleSplit(coach_notes, c._fontname, c._fontsize, box_width - 10)
-    
-        # Center vertically
-        start_y = box_y + box_height - 35  # start below header
-        line_height = 12
-        for line in wrapped_lines:
-            c.drawString(box_x + 8, start_y, line)
-            start_y -= line_height
-            if start_y < box_y + 8:  # stop if we reach bottom of box
-                break
-
-    # ---- DISCLAIMER ----
-    disclaimer_text = (
-        "Performance grades and progress indicators are calculated using LCB Training evaluation standards "
-        "based on program benchmarks and national age-group averages.\n\n"
-        "Results may vary based on development, training history, and testing conditions."
-    )
-    
-    styles = getSampleStyleSheet()
-    disclaimer_style = styles["Normal"]
-    disclaimer_style.fontName = "Helvetica"
-    disclaimer_style.fontSize = 8
-    disclaimer_style.leading = 10
-    disclaimer_style.textColor = colors.grey
-    disclaimer_style.alignment = TA_CENTER
-    
-    paragraph = Paragraph(disclaimer_text.replace("\n", "<br/>"), disclaimer_style)
-    
-    # Set width and auto-calc height
-    max_width = width - 80
-    w, h = paragraph.wrap(max_width, 100)  # wrap(width, maxHeight)
-    
-    # Draw centered above footer
-    paragraph.drawOn(c, (width - max_width) / 2, 55)
-
-    
-    # ---- FOOTER ----
-    c.setFont("Helvetica-Oblique", 6)
-    c.setFillColor(colors.grey)
-    c.drawCentredString(
-        width / 2,
-        30,
-        "Generated by LCB Training Performance Portal • Work Hard. Be Memorable."
-    )
-
-    c.showPage()
-    c.save()
-
-    return temp_file.name
-
-# =========================
-# GLOBAL STYLE
-# =========================
-st.markdown("""
-<style>
-
-/* HEADER WRAPPER */
-.header-wrapper {
-    background-color: #000000;
-    padding: 18px;
-    border-radius: 12px;
-    margin-bottom: 25px;
-    display: flex;
-    align-items: center;
-}
-
-/* LOGO */
-.header-logo {
-    width: 55px;  /* Smaller logo */
-    margin-right: 20px;
-}
-
-/* HEADER TEXT */
-.header-text h1 {
-    color: white;
-    margin: 0;
-    font-size: 32px;
-    font-weight: 700;
-}
-
-.header-text p {
-    color: #cccccc;
-    margin: 0;
-    font-size: 14px;
-}
-
-/* SLOGAN */
-.header-text .slogan {
-    color: #bbbbbb;
-    margin-top: 6px;
-    font-size: 13px;
-}
-
-/* CARD */
-.card {
-    padding: 20px;
-    background-color: #FFFFFF;
-    border-radius: 14px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.18);
-    margin-bottom: 25px;
-}
-
-/* KPI TILE */
-.kpi {
-    padding: 14px;
-    background-color: #F5F5F5;
-    border-radius: 12px;
-    text-align: center;
-    box-shadow: 0 1px 5px rgba(0,0,0,0.12);
-}
-
-.kpi h4 {
-    margin: 4px 0 6px 0;
-    font-size: 14px;
-    color: #444;
-}
-
-.kpi b {
-    font-size: 18px;
-    color: #000;
-}
-
-</style>
-""", unsafe_allow_html=True)
+def plot_chart(fig, section):
+    ledger.record(section, "figures", fig)
+    st.plotly_chart(fig, width="stretch")
 
 # =========================
-# HEADER WITH LOGO + SLOGAN
+# REPORT JOBS
 # =========================
-def image_to_base64(img):
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
+# Each session keeps the ids of the reports it asked for. While any of them is
+# still rendering, the panel re-runs on its own every JOB_POLL_SECONDS without
+# rerunning the rest of the page.
+JOB_POLL_SECONDS = 1.0
+SESSION_JOBS_SHOWN = 5
+
+def report_jobs_panel(polling):
+    queue = get_job_queue()
+    jobs = [job for job in map(queue.get, st.session_state.get("report_jobs", [])) if job is not None]
+
+    for job in reversed(jobs):
+        if job.active:
+            st.progress(job.progress, text=f"{job.label}: {job.message}")
+        elif job.status == "done":
+            st.download_button(
+                f"⬇️ Download {job.label} (PDF)",
+                job.result,
+                file_name=job.file_name,
+                mime=job.mime,
+                key=f"job_download_{job.id}"
+            )
+        else:
+            st.error(f"{job.label} failed: {job.error}")
 
-try:
-    logo = Image.open("lcb training logo.png")
-    logo_b64 = image_to_base64(logo)
-
-    st.markdown(
-    f"""
-    <style>
-        .header-wrapper {{
-            display: flex;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .header-logo {{
-            width: 120px;
-            height: auto;
-            border-radius: 12px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-        .header-text h1 {{
-            margin: 0;
-            font-size: 36px;
-            color: #FFFFFF;
-        }}
-        .header-text p {{
-            margin: 2px 0;
-            font-size: 16px;
-            color: #FFFFFF;
-        }}
-        .header-text .slogan {{
-            font-size: 14px;
-            font-style: italic;
-            color: #FFFFFF;
-            margin-top: 5px;
-            max-width: 600px;
-        }}
-    </style>
-
-    <div class="header-wrapper">
-        <img src="data:image/png;base64,{logo_b64}" class="header-logo">
-        <div class="header-text">
-            <h1>LCB Training Performance Dashboard</h1>
-            <p>Player Development • Strength • Speed • Confidence</p>
-            <p class="slogan">Elite Player Development Training for Teams and Players — <b>Helping Athletes Build Strength, Skill, and Confidence On and Off the Field</b></p>
-        </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-except:
-    st.warning("Logo not found — make sure 'lcb training logo.png' is present.")
+    # Everything finished: one full rerun turns polling back off
+    if polling and not any(job.active for job in jobs):
+        st.rerun()
 
 # =========================
 # TABS
 # =========================
-tab1, tab2, tab3 = st.tabs(["👤 Player", "👥 Team", "🏆 LCB Training Leaderboard"])
+tab1, tab2, tab3, tab4 = st.tabs(["👤 Player", "👥 Team", "🏆 LCB Training Leaderboard", "📦 Export"])
 
 # =============================================================
 # --------------------- PLAYER TAB ----------------------------
@@ -638,190 +126,128 @@ with tab1:
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.subheader("Player Dashboard — Overview")
 
-    players = sorted(df["full_name"].dropna().unique())
+    # Search and facets run against an index built once per data version
+    player_index = get_player_index(data_version, df)
+    search_col, team_col, age_col = st.columns([2, 1, 1])
+    query = search_col.text_input("Search Players", placeholder="Start typing a name...", key="player_search")
+    team_facets = player_index.team_facets()
+    facet_team = team_col.selectbox(
+        "Team",
+        [None] + list(team_facets),
+        format_func=lambda t: "All Teams" if t is None else f"{t} ({team_facets[t]})",
+        key="player_team_facet"
+    )
+    age_facets = player_index.age_group_facets()
+    facet_age_group = age_col.selectbox(
+        "Age Group",
+        [None] + list(age_facets),
+        format_func=lambda g: "All Age Groups" if g is None else f"{g} ({age_facets[g]})",
+        key="player_age_facet"
+    )
+
+    players = player_index.search(query, team=facet_team, age_group=facet_age_group)
     selected_player = st.selectbox("Select Player", players)
+    if selected_player and st.session_state.get("last_viewed_player") != selected_player:
+        st.session_state["last_viewed_player"] = selected_player
+        get_view_counter().hit(selected_player)
+    player_start, player_end = date_range_control("player")
 
-    if selected_player:
-        player_df = df[df["full_name"] == selected_player].copy()
+    # Derived views come from the process-wide LRU cache
+    views = get_player_views(store, selected_player, player_start, player_end, aggregates) if selected_player else None
 
-        if player_df.empty:
-            st.info("No records found for this player.")
-        else:
-            # ---------------------------
-            # GET MOST RECENT PLAYER INFO
-            # ---------------------------
-            most_recent = player_df.sort_values("Date").iloc[-1]
-            player_age = int(most_recent["Age"]) if not pd.isna(most_recent["Age"]) else None
-            player_team = most_recent["Team"] if str(most_recent["Team"]) != "nan" else "N/A"
-            age_group = get_age_group(player_age) if player_age else "N/A"
+    if views is None or views.empty:
+        st.info("No records found for this player in the selected date range.")
+    else:
+        player_df = views.player_df
+        ledger.record("Player", "views (cached)", views)
 
-            # ---------------------------
-            # PDF GENERATION
-            # ---------------------------
+        # ---------------------------
+        # GET MOST RECENT PLAYER INFO
+        # ---------------------------
+        player_age, player_team, age_group = views.player_age, views.player_team, views.age_group
 
-            coach_notes = st.text_area(
-                "Coach Broc Notes (optional)",
-                placeholder="Type any tips or observations here..."
+        # ---------------------------
+        # PDF GENERATION
+        # ---------------------------
+
+        coach_notes = st.text_area(
+            "Coach Broc Notes (optional)",
+            placeholder="Type any tips or observations here..."
+        )
+        
+        if st.button("📄 Create Summary Report"):
+            # Nightly reports cover the full history with no coach notes
+            prebuilt_path = None
+            if SNAPSHOT_DIR and not coach_notes and player_start is None and player_end is None:
+                prebuilt_path = get_snapshot(data_version).report_path(selected_player)
+
+            # Rendering happens on the job queue; the panel below polls for it
+            job_id = submit_player_report(
+                views,
+                selected_player,
+                coach_notes,
+                window=(player_start, player_end),
+                data_version=store.player_version(selected_player),
+                prebuilt_path=prebuilt_path
             )
-            
-            if st.button("📄 Create Summary Report"):
-                pdf_path = create_player_summary_pdf(
-                    selected_player,
-                    player_df,
-                    age_group,
-                    player_team,
-                    coach_notes
-                )
+            session_jobs = [j for j in st.session_state.get("report_jobs", []) if j != job_id]
+            st.session_state["report_jobs"] = (session_jobs + [job_id])[-SESSION_JOBS_SHOWN:]
 
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        "⬇️ Download Player Report (PDF)",
-                        f,
-                        file_name=f"{selected_player.replace(' ', '_')}_LCB_Report.pdf",
-                        mime="application/pdf"
-                    )
+        polling = any(
+            job is not None and job.active
+            for job in map(get_job_queue().get, st.session_state.get("report_jobs", []))
+        )
+        st.fragment(run_every=JOB_POLL_SECONDS if polling else None)(report_jobs_panel)(polling)
 
-            # ---------------------------
-            # PLAYER SUMMARY
-            # ---------------------------
-            st.markdown("<h3 style='margin-bottom:10px'>📊 Player Summary</h3>", unsafe_allow_html=True)
+        # ---------------------------
+        # PLAYER SUMMARY
+        # ---------------------------
+        st.markdown("<h3 style='margin-bottom:10px'>📊 Player Summary</h3>", unsafe_allow_html=True)
 
-            colA, colB, colC = st.columns(3)
-            colA.markdown(f"<div class='kpi'><h4>Player</h4><b>{selected_player}</b></div>", unsafe_allow_html=True)
-            colB.markdown(f"<div class='kpi'><h4>Team</h4><b>{player_team}</b></div>", unsafe_allow_html=True)
-            colC.markdown(f"<div class='kpi'><h4>Age Group</h4><b>{age_group}</b></div>", unsafe_allow_html=True)
+        render_kpi_grid([
+            kpi_card("Player", selected_player),
+            kpi_card("Team", player_team),
+            kpi_card("Age Group", age_group)
+        ], columns=3)
 
-            st.markdown("<hr>", unsafe_allow_html=True)
+        st.markdown("<hr>", unsafe_allow_html=True)
 
         # ===========================
         # RESULTS SUMMARY TABLE (FIRST, LATEST, BEST, GROWTH)
         # ===========================
         st.markdown("### 📘 Results Summary")
         
-        rows = []
-        for metric in player_df["Metric_Type"].unique():
-            mdf = player_df[player_df["Metric_Type"] == metric].sort_values("Date")
+        summary_df = views.summary_df
         
-            # ----- NEW LOGIC FOR FIRST & LATEST -----
-            if metric in lower_is_better:
-                first = mdf["Lowest"].iloc[0] if "Lowest" in mdf else mdf["Average"].iloc[0]
-                latest = mdf["Lowest"].iloc[-1] if "Lowest" in mdf else mdf["Average"].iloc[-1]
-            else:
-                first = mdf["Highest"].iloc[0] if "Highest" in mdf else mdf["Average"].iloc[0]
-                latest = mdf["Highest"].iloc[-1] if "Highest" in mdf else mdf["Average"].iloc[-1]
-
-            # Best logic stays the same
-            if metric in lower_is_better:
-                best = mdf["Lowest"].min()
-                growth = first - best  
-            else:
-                best = mdf["Highest"].max()
-                growth = best - first
-
-            goal = targets.get(age_group, {}).get(metric, None)
-        
-            rows.append({
-                "Metric": metric,
-                "First": first,
-                "Latest": latest,
-                "Best": best,
-                "Growth": growth,
-                "Goal": goal
-            })
-        
-        summary_df = pd.DataFrame(rows)
-        
-        # ---- FORMAT NUMERIC COLUMNS ----
-        numeric_cols = ["First", "Latest", "Best", "Growth", "Goal"]
-        format_dict = {col: "{:.2f}" for col in numeric_cols if col in summary_df.columns}
-        
-        # ---- CONDITIONAL FORMATTING FOR 'Best' ----
-        def color_best_row(row):
-            metric = row["Metric"]
-            val = row["Best"]
-            goal_val = targets.get(age_group, {}).get(metric, None)
-            if goal_val is None:
-                return [""] * len(row)  # no formatting
-            if metric in lower_is_better:
-                color = "color: green" if val <= goal_val else "color: red"
-            else:
-                color = "color: green" if val >= goal_val else "color: red"
-            # Apply color only to 'Best', empty string for other columns
-            return [""]*row.index.get_loc("Best") + [color] + [""]*(len(row)-row.index.get_loc("Best")-1)
-        
-        summary_df_styled = summary_df.style.format(format_dict)\
-            .apply(color_best_row, axis=1)
-        
-        st.dataframe(summary_df_styled, width="stretch")
+        # Status is precomputed against the age group's goal for the Best column
+        render_table(
+            summary_df,
+            number_cols=SUMMARY_NUMERIC_COLS,
+            Status=st.column_config.TextColumn("Status", help="Best vs. age group goal")
+        )
         
         # =========================
         # BEST PERFORMANCES TABLE
         # =========================
         st.markdown("### 🏅 Best Performance by Metric")
         
-        summary_data = []
-        for metric in player_df["Metric_Type"].unique():
-            df_metric = player_df[player_df["Metric_Type"] == metric]
-            best_score = df_metric["Lowest"].min() if metric in lower_is_better else df_metric["Highest"].max()
-            summary_data.append({"Metric": metric, "Best Score": best_score})
+        best_df = views.best_df
         
-        best_df = pd.DataFrame(summary_data)
-        best_df["Best Score"] = pd.to_numeric(best_df["Best Score"], errors="coerce")
-        
-        st.dataframe(
-            best_df.style.format({"Best Score": "{:.2f}"}),
-            width="stretch"
-        )
+        render_table(best_df, number_cols=["Best Score"])
         
         # =========================
         # PERFORMANCE TRENDS
         # =========================
         st.markdown("### 📈 Performance Trends")
         
-        # --- Metric Groups ---
-        baseball_metrics = [
-            "Arm Speed Pitch", "Arm Speed Reg",
-            "BES Flip", "BES Tee"
-        ]
-        
-        speed_metrics = [
-            "10 yard sprint", "Pro Agility"
-        ]
-        
-        # Helper function to compute summary for cards
-        def get_metric_summary(df, metric):
-            mdf = df[df["Metric_Type"] == metric].sort_values("Date")
-            if mdf.empty:
-                return None, None, None
-        
-            # --- NEW LOGIC FOR FIRST & LATEST ---
-            if metric in lower_is_better:
-                first = mdf["Lowest"].iloc[0] if "Lowest" in mdf.columns else mdf["Average"].iloc[0]
-                latest = mdf["Lowest"].iloc[-1] if "Lowest" in mdf.columns else mdf["Average"].iloc[-1]
-            else:
-                first = mdf["Highest"].iloc[0] if "Highest" in mdf.columns else mdf["Average"].iloc[0]
-                latest = mdf["Highest"].iloc[-1] if "Highest" in mdf.columns else mdf["Average"].iloc[-1]
-
-            if metric in lower_is_better:
-                best = mdf["Lowest"].min()
-                growth = first - best   # lower = better
-            else:
-                best = mdf["Highest"].max()
-                growth = best - first   # higher = better
-        
-            return first, best, growth
-        
-        
         # -----------------------------
         # KPI Cards for Baseball Metrics
         # -----------------------------
         st.markdown("#### Strength Performance Metrics")
         
-        df_baseball = player_df[player_df["Metric_Type"].isin(baseball_metrics)]
+        df_baseball = views.strength_df
         
         if not df_baseball.empty:
-            df_baseball["Month"] = df_baseball["Date"].dt.month
-        
             # First half of year
             df_h1 = df_baseball[df_baseball["Month"] <= 6]
             if not df_h1.empty:
@@ -832,7 +258,7 @@ with tab1:
                     title="Strength Performance (Jan - Jun)"
                 )
                 fig_h1.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_h1, width="stretch")
+                plot_chart(fig_h1, "Player")
         
             # Second half of year
             df_h2 = df_baseball[df_baseball["Month"] > 6]
@@ -844,37 +270,17 @@ with tab1:
                     title="Strength Performance (Jul - Dec)"
                 )
                 fig_h2.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_h2, width="stretch")
+                plot_chart(fig_h2, "Player")
 
         
-            card_cols = st.columns(4)
-            for i, metric in enumerate(baseball_metrics):
-                first, best, growth = get_metric_summary(player_df, metric)
+            cards = []
+            for metric in baseball_metrics:
+                first, best, growth = views.metric_summary(metric)
                 if first is None:
                     continue
-        
-                # Determine arrow and color
-                if growth > 0:
-                    growth_color = "#00B050"  # vivid green
-                    arrow = "▲"
-                elif growth < 0:
-                    growth_color = "#FF0000"  # bright red
-                    arrow = "▼"
-                else:
-                    growth_color = "#000000"  # black if no change
-                    arrow = ""
-        
-                with card_cols[i % 4]:
-                    st.markdown(f"""
-                    <div class='kpi' style="text-align:center; padding:20px;">
-                        <h3 style="margin:0 0 10px 0; font-size:20px; color:blue;">{metric}</h3>
-                        <p style="margin:4px 0; font-size:18px; color:blue;"><b>First:</b> {first:.2f}</p>
-                        <p style="margin:4px 0; font-size:18px; color:blue;"><b>Best:</b> {best:.2f}</p>
-                        <p style="margin:8px 0 0 0; font-size:20px; font-weight:700; color:{growth_color};">
-                            {arrow} {growth:.2f}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                cards.append(metric_card(metric, first, best, growth))
+
+            render_kpi_grid(cards, columns=4)
 
         
         # Add vertical space
@@ -885,11 +291,9 @@ with tab1:
         # -----------------------------
         st.markdown("#### Speed & Agility Performance Metrics")
         
-        df_baseball = player_df[player_df["Metric_Type"].isin(speed_metrics)]
+        df_baseball = views.speed_df
         
         if not df_baseball.empty:
-            df_baseball["Month"] = df_baseball["Date"].dt.month
-        
             # First half of year (Jan - Jun)
             df_h1 = df_baseball[df_baseball["Month"] <= 6]
             if not df_h1.empty:
@@ -900,7 +304,7 @@ with tab1:
                     title="Speed & Agility Performance (Jan - Jun)"
                 )
                 fig_h1.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_h1, width="stretch")
+                plot_chart(fig_h1, "Player")
         
             # Second half of year (Jul - Dec)
             df_h2 = df_baseball[df_baseball["Month"] > 6]
@@ -912,37 +316,17 @@ with tab1:
                     title="Speed & Agility Performance (Jul - Dec)"
                 )
                 fig_h2.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_h2, width="stretch")
+                plot_chart(fig_h2, "Player")
 
         
-            card_cols = st.columns(2)
-            for i, metric in enumerate(speed_metrics):
-                first, best, growth = get_metric_summary(player_df, metric)
+            cards = []
+            for metric in speed_metrics:
+                first, best, growth = views.metric_summary(metric)
                 if first is None:
                     continue
-        
-                # Determine arrow and color
-                if growth > 0:
-                    growth_color = "#00B050"  # vivid green
-                    arrow = "▲"
-                elif growth < 0:
-                    growth_color = "#FF0000"  # bright red
-                    arrow = "▼"
-                else:
-                    growth_color = "#000000"  # black if no change
-                    arrow = ""
-        
-                with card_cols[i % 2]:
-                    st.markdown(f"""
-                    <div class='kpi' style="text-align:center; padding:20px;">
-                        <h3 style="margin:0 0 10px 0; font-size:18px; color:blue;">{metric}</h3>
-                        <p style="margin:4px 0; font-size:18px; color:blue;"><b>First:</b> {first:.2f}</p>
-                        <p style="margin:4px 0; font-size:18px; color:blue;"><b>Best:</b> {best:.2f}</p>
-                        <p style="margin:8px 0 0 0; font-size:20px; font-weight:700; color:{growth_color};">
-                            {arrow} {growth:.2f}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                cards.append(metric_card(metric, first, best, growth))
+
+            render_kpi_grid(cards, columns=2)
 
 
 # =============================================================
@@ -955,31 +339,35 @@ with tab2:
     # ---------------------------
     # Team Selection
     # ---------------------------
-    teams = sorted(df["Team"].dropna().unique())
+    teams = options["teams"]
     selected_team = st.selectbox("Select Team", teams)
+    team_start, team_end = date_range_control("team")
 
     if selected_team:
-        team_df = df[df["Team"] == selected_team].copy()
+        team_df = store.scan(team_start, team_end, Team=selected_team)
+        ledger.record("Team", "frames", team_df)
 
         if team_df.empty:
-            st.warning("No data found for this team.")
+            st.warning("No data found for this team in the selected date range.")
         else:
             # ---------------------------
             # Team Summary KPIs
             # ---------------------------
             st.markdown("<h3>📊 Team Summary</h3>", unsafe_allow_html=True)
 
-            # Calculate averages for the team
-            avg_age = round(team_df["Age"].mean(), 1)
-            avg_bes_tee = round(team_df[team_df["Metric_Type"].isin(["BES Tee"])]["Average"].mean(), 1)
-            avg_sprint = round(team_df[team_df["Metric_Type"].isin(["10 yard sprint"])]["Average"].mean(), 1)
-            avg_speed = round(team_df[team_df["Metric_Type"].isin(["Pro Agility"])]["Average"].mean(), 1)
+            # Averages come from the running team aggregates (or the rows while they build)
+            team_age, team_means = aggregates.team_means(selected_team, team_start, team_end)
+            avg_age = round(team_age, 1)
+            avg_bes_tee = round(team_means.get("BES Tee", float("nan")), 1)
+            avg_sprint = round(team_means.get("10 yard sprint", float("nan")), 1)
+            avg_speed = round(team_means.get("Pro Agility", float("nan")), 1)
 
-            kpi_cols = st.columns(4)
-            kpi_cols[0].markdown(f"<div class='kpi'><h4>Avg Age</h4><b>{avg_age}</b></div>", unsafe_allow_html=True)
-            kpi_cols[1].markdown(f"<div class='kpi'><h4>Avg BES Tee</h4><b>{avg_bes_tee}</b></div>", unsafe_allow_html=True)
-            kpi_cols[2].markdown(f"<div class='kpi'><h4>Avg 10 Yard Sprint</h4><b>{avg_sprint}</b></div>", unsafe_allow_html=True)
-            kpi_cols[3].markdown(f"<div class='kpi'><h4>Avg Pro Agility</h4><b>{avg_speed}</b></div>", unsafe_allow_html=True)
+            render_kpi_grid([
+                kpi_card("Avg Age", avg_age),
+                kpi_card("Avg BES Tee", avg_bes_tee),
+                kpi_card("Avg 10 Yard Sprint", avg_sprint),
+                kpi_card("Avg Pro Agility", avg_speed)
+            ], columns=4)
 
             st.markdown("<hr>", unsafe_allow_html=True)
 
@@ -988,36 +376,36 @@ with tab2:
             # ---------------------------
             st.markdown("### Team Strength Metrics")
             
-            # Filter strength metrics for the team
-            team_strength = team_df[team_df["Metric_Type"].isin(baseball_metrics)]
-            if not team_strength.empty:
-                strength_metrics = team_strength.groupby(["Date", "Metric_Type"])["Average"].mean().reset_index()
+            # Team means per test date for the strength metrics
+            strength_trend = aggregates.team_trend(selected_team, baseball_metrics, team_start, team_end)
+            ledger.record("Team", "frames", strength_trend)
+            if not strength_trend.empty:
                 fig_strength = px.line(
-                    strength_metrics.sort_values("Date"),
+                    strength_trend,
                     x="Date", y="Average", color="Metric_Type",
                     markers=True,
                     title=f"{selected_team} Strength Performance Over Time"
                 )
                 fig_strength.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_strength, width="stretch")
+                plot_chart(fig_strength, "Team")
             
             # ---------------------------
             # Team Performance Trends - Speed & Agility
             # ---------------------------
             st.markdown("### Team Speed & Agility Metrics")
             
-            # Filter speed metrics for the team
-            team_speed = team_df[team_df["Metric_Type"].isin(speed_metrics)]
-            if not team_speed.empty:
-                speed_metrics = team_speed.groupby(["Date", "Metric_Type"])["Average"].mean().reset_index()
+            # Team means per test date for the speed metrics
+            speed_trend = aggregates.team_trend(selected_team, speed_metrics, team_start, team_end)
+            ledger.record("Team", "frames", speed_trend)
+            if not speed_trend.empty:
                 fig_speed = px.line(
-                    speed_metrics.sort_values("Date"),
+                    speed_trend,
                     x="Date", y="Average", color="Metric_Type",
                     markers=True,
                     title=f"{selected_team} Speed & Agility Performance Over Time"
                 )
                 fig_speed.update_layout(height=350, legend_title_text="Metric")
-                st.plotly_chart(fig_speed, width="stretch")
+                plot_chart(fig_speed, "Team")
             
             st.markdown("<hr>", unsafe_allow_html=True)
 
@@ -1032,32 +420,13 @@ with tab2:
             selected_metric = st.selectbox("Select Metric to View Top Performers", metrics_for_filter)
             
             if selected_metric:
-                metric_df = team_df[team_df["Metric_Type"] == selected_metric].copy()
+                top_players_metric = build_top_performers(team_df, selected_metric)
+                ledger.record("Team", "frames", top_players_metric)
             
-                if metric_df.empty:
+                if top_players_metric.empty:
                     st.warning("No data found for this metric.")
                 else:
-                    # Determine whether to use max or min based on metric type
-                    if selected_metric in lower_is_better:
-                        top_players_metric = metric_df.groupby("player_id").agg({
-                            "Player_name_first": "first",
-                            "Player_name_last": "first",
-                            "Average": "min"  # lower is better
-                        }).reset_index()
-                    else:
-                        top_players_metric = metric_df.groupby("player_id").agg({
-                            "Player_name_first": "first",
-                            "Player_name_last": "first",
-                            "Average": "max"  # higher is better
-                        }).reset_index()
-            
-                    top_players_metric["Full Name"] = top_players_metric["Player_name_first"] + " " + top_players_metric["Player_name_last"]
-                    top_players_metric = top_players_metric.sort_values("Average", ascending=(selected_metric in lower_is_better))
-            
-                    st.dataframe(
-                        top_players_metric[["Full Name", "Average"]].head(10).style.format({"Average": "{:.2f}"}),
-                        width="stretch"
-                    )
+                    render_table(top_players_metric, number_cols=["Average"])
 
 
 # =============================================================
@@ -1068,44 +437,116 @@ with tab3:
     st.subheader("LCB Training Leaderboard — Top Performers")
 
     # ---- Metric Filter ----
-    metric_list = sorted(df["Metric_Type"].unique())
+    metric_list = options["metrics"]
     selected_metric = st.selectbox("Select Metric", metric_list)
 
     # ---- Age Filter ----
-    age_options = ["All Ages"] + sorted(df["Age"].unique())
+    age_options = ["All Ages"] + options["ages"]
     selected_age = st.selectbox("Filter by Age", age_options)
 
-    # Apply age filter
-    if selected_age != "All Ages":
-        df_filtered = df[df["Age"] <= int(selected_age)]
-    else:
-        df_filtered = df.copy()
+    # ---- Build leaderboard ----
+    leaderboard = aggregates.leaderboard(
+        selected_metric,
+        max_age=None if selected_age == "All Ages" else selected_age
+    )
 
-    # ---- Filter data for selected metric ----
-    df_metric = df_filtered[df_filtered["Metric_Type"] == selected_metric]
+    ledger.record("Leaderboard", "frames", leaderboard)
 
-    # ---- Build leaderboard rows ----
-    rows = []
-    for player, pdf in df_metric.groupby("full_name"):
-        pdf = pdf.sort_values("Date")
+    # ---- Display top performers ----
+    render_table(leaderboard.head(15), number_cols=["Lowest", "Highest"])
 
-        if selected_metric in lower_is_better:
-            value = pdf["Average"].min()  # lowest is better
-            rows.append({"full_name": player, "Age": pdf["Age"].iloc[-1], "Lowest": value})
-        else:
-            value = pdf["Average"].max()  # highest is better
-            rows.append({"full_name": player, "Age": pdf["Age"].iloc[-1], "Highest": value})
+    st.markdown("</div>", unsafe_allow_html=True)
 
-    leaderboard = pd.DataFrame(rows)
 
-    # ---- Sorting ----
-    if selected_metric in lower_is_better:
-        leaderboard = leaderboard.sort_values("Lowest", ascending=True)
-    else:
-        leaderboard = leaderboard.sort_values("Highest", ascending=False)
+# =============================================================
+# ---------------------- EXPORT TAB ---------------------------
+# =============================================================
+with tab4:
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.subheader("Export Training Data")
 
-    # ---- Display top performers ----
-    st.dataframe(leaderboard.head(15), width="stretch")
+    export_source = st.radio("Dataset", list(exports.EXPORT_SOURCES), horizontal=True)
+    export_format = st.radio("Format", list(exports.EXPORT_FORMATS), horizontal=True)
+
+    export_team = st.selectbox("Team", ["All Teams"] + teams, key="export_team")
+    export_age_group = st.selectbox("Age Group", ["All Age Groups"] + AGE_GROUPS, key="export_age_group")
+    export_start, export_end = date_range_control("export")
+
+    export_team = None if export_team == "All Teams" else export_team
+    export_age_group = None if export_age_group == "All Age Groups" else export_age_group
+
+    export_args = (export_source, export_format, store, export_start, export_end, export_team, export_age_group)
+    export_name = exports.export_file_name(export_source, export_format, export_team, export_age_group)
+
+    if st.get_option("server.enableStaticServing"):
+        # Written to disk chunk by chunk and downloaded straight from there
+        export_key = (data_version,) + export_args[:2] + export_args[3:]
+        if st.button("📦 Prepare Export"):
+            with st.spinner("Writing export..."):
+                st.session_state["export"] = (export_key, exports.export_file(*export_args))
+
+        prepared = st.session_state.get("export")
+        if prepared and prepared[0] == export_key and os.path.exists(prepared[1]):
+            if os.path.getsize(prepared[1]) > exports.STATIC_MAX_BYTES:
+                st.warning("This export is too large to download. Narrow the team, age group or date range.")
+            else:
+                st.markdown(
+                    f"<a href='{exports.export_url(prepared[1])}' download='{export_name}'>⬇️ Download {export_name}</a>",
+                    unsafe_allow_html=True
+                )
+    else:
+        # The file is only built (chunk by chunk) when the button is clicked,
+        # but the finished file is held in memory while it's served
+        st.download_button(
+            "⬇️ Download Export",
+            data=partial(exports.export_bytes, *export_args),
+            file_name=export_name,
+            mime=exports.EXPORT_FORMATS[export_format][1]
+        )
 
     st.markdown("</div>", unsafe_allow_html=True)
 
+
+# =============================================================
+# ------------------ MEMORY ACCOUNTING ------------------------
+# =============================================================
+caches = memory.cache_sizes(data_version, df, store, aggregate_state if aggregate_ready else None, player_index)
+ledger.log(caches)
+
+if st.query_params.get("admin") == "memory":
+    with st.expander("🧠 Memory accounting", expanded=True):
+        traced, traced_peak = ledger.traced()
+        pdf_count, pdf_bytes = memory.temp_pdfs()
+        render_kpi_grid([
+            kpi_card("Process RSS", memory.format_bytes(memory.rss_bytes())),
+            kpi_card("Peak RSS", memory.format_bytes(memory.peak_rss_bytes())),
+            kpi_card("Process Caches", memory.format_bytes(sum(caches.values()))),
+            kpi_card("This Run", memory.format_bytes(sum(ledger.section_totals().values()))),
+            kpi_card("Traced Peak", memory.format_bytes(traced_peak)),
+            kpi_card("Temp PDFs", f"{pdf_count} / {memory.format_bytes(pdf_bytes)}")
+        ], columns=3)
+
+        st.caption(
+            f"Warm-up: {warmup.status}"
+            + (f" ({warmup.step})" if warmup.step else "")
+            + "".join(f" · {step} {seconds:.2f}s" for step, seconds in warmup.timings.items())
+        )
+        dropped = get_dirty_tracker().dropped
+        st.caption(
+            f"Last data refresh: {changes.describe()}"
+            + "".join(f" · dropped {n} {kind}" for kind, n in dropped.items())
+        )
+
+        st.markdown("#### Process-wide caches")
+        cache_df = pd.DataFrame(list(caches.items()), columns=["Cache", "Bytes"])
+        render_table(cache_df.assign(Size=cache_df["Bytes"].map(memory.format_bytes)))
+
+        st.markdown("#### This run, by section")
+        st.caption("Cached views are shared across sessions and are also counted in the caches above.")
+        section_df = ledger.section_frame()
+        render_table(section_df.assign(Size=section_df["Bytes"].map(memory.format_bytes)))
+
+        if traced is not None:
+            st.markdown("#### Top allocation sites (tracemalloc)")
+            top_df = memory.top_allocations()
+            render_table(top_df.assign(Size=top_df["Bytes"].map(memory.format_bytes)))
@@ -0,0 +1,196 @@
+import os
+
+import pandas as pd
+
+
+# =========================
+# SEASON / MONTH PARTITIONS
+# =========================
+# Training history is stored as one frame per (season, month). A season is the
+# calendar year the test was taken in. Date-range queries only touch the
+# partitions that overlap the window, and equality filters are applied inside
+# each partition before anything is concatenated.
+
+def partition_key(date):
+    return (date.year, date.month)
+
+
+def season_bounds(season):
+    return pd.Timestamp(season, 1, 1), pd.Timestamp(season, 12, 31)
+
+
+def frame_version(df):
+    # Content hash of a frame, used as a data-version token by derived caches
+    return format(int(pd.util.hash_pandas_object(df, index=False).sum()) & (2**64 - 1), "016x")
+
+
+def group_versions(df, column):
+    # frame_version of each group's rows, e.g. one token per player
+    if df.empty or column not in df.columns:
+        return {}
+    sums = pd.util.hash_pandas_object(df, index=False).groupby(df[column].to_numpy(), sort=False).sum()
+    return {key: format(int(total) & (2**64 - 1), "016x") for key, total in sums.items()}
+
+
+class PartitionedStore:
+    def __init__(self, partitions, undated=None, columns=None, version=None, player_versions=None):
+        self._partitions = dict(sorted(partitions.items()))
+        self._undated = undated
+        self.columns = list(columns) if columns is not None else []
+        self.version = version
+        self._player_versions = player_versions
+
+    @classmethod
+    def from_frame(cls, df, version=None, player_versions=None):
+        if version is None:
+            version = frame_version(df)
+        if player_versions is None:
+            player_versions = group_versions(df, "full_name")
+        if df.empty or "Date" not in df.columns:
+            return cls({}, undated=df, columns=df.columns, version=version, player_versions=player_versions)
+
+        dated = df[df["Date"].notna()]
+        undated = df[df["Date"].isna()]
+        keys = pd.MultiIndex.from_arrays([dated["Date"].dt.year, dated["Date"].dt.month])
+
+        partitions = {
+            (int(season), int(month)): part.reset_index(drop=True)
+            for (season, month), part in dated.groupby(keys, sort=True)
+        }
+        return cls(
+            partitions,
+            undated=undated.reset_index(drop=True) if not undated.empty else None,
+            columns=df.columns,
+            version=version,
+            player_versions=player_versions
+        )
+
+    # ---------------------------
+    # METADATA
+    # ---------------------------
+    def keys(self):
+        return list(self._partitions)
+
+    def seasons(self):
+        return sorted({season for season, _ in self._partitions})
+
+    def date_bounds(self):
+        if not self._partitions:
+            return None, None
+        first = next(iter(self._partitions.values()))["Date"].min()
+        last = next(reversed(self._partitions.values()))["Date"].max()
+        return first, last
+
+    def player_version(self, player):
+        # Content hash of one player's rows. Per-player caches key on this
+        # rather than the store version, so they survive refreshes that
+        # didn't touch the player (see dirty.py).
+        if not self._player_versions:
+            return self.version
+        return self._player_versions.get(player, self.version)
+
+    def __len__(self):
+        rows = sum(len(part) for part in self._partitions.values())
+        return rows + (len(self._undated) if self._undated is not None else 0)
+
+    def memory_usage(self):
+        # Deep byte count of every partition held in memory
+        parts = list(self._partitions.values())
+        if self._undated is not None:
+            parts.append(self._undated)
+        return int(sum(part.memory_usage(deep=True).sum() for part in parts))
+
+    # ---------------------------
+    # PRUNING + SCANNING
+    # ---------------------------
+    def keys_for(self, start=None, end=None):
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        lo = partition_key(start) if start is not None else None
+        hi = partition_key(end) if end is not None else None
+        return [
+            key for key in self._partitions
+            if (lo is None or key >= lo) and (hi is None or key <= hi)
+        ]
+
+    def iter_partitions(self, start=None, end=None, columns=None, **filters):
+        # Yield the filtered rows of each partition overlapping [start, end]
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        sources = [self._partitions[key] for key in self.keys_for(start, end)]
+        if start is None and end is None and self._undated is not None:
+            sources.append(self._undated)
+
+        for part in sources:
+            mask = pd.Series(True, index=part.index)
+            for col, value in filters.items():
+                if isinstance(value, (list, tuple, set, frozenset)):
+                    mask &= part[col].isin(value)
+                else:
+                    mask &= part[col] == value
+            # Only the boundary partitions need a row-level date check
+            if start is not None:
+                mask &= part["Date"] >= start
+            if end is not None:
+                mask &= part["Date"] < end.normalize() + pd.Timedelta(days=1)
+
+            if mask.all():
+                rows = part.copy(deep=False)
+            elif mask.any():
+                rows = part[mask]
+            else:
+                continue
+            yield rows[columns] if columns is not None else rows
+
+    def scan(self, start=None, end=None, columns=None, **filters):
+        # Rows in [start, end] matching every column=value filter
+        parts = list(self.iter_partitions(start, end, columns=columns, **filters))
+        if not parts:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+    # ---------------------------
+    # ON-DISK LAYOUT
+    # ---------------------------
+    # <directory>/season=2025/month=03.parquet
+    # <directory>/undated.parquet
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for (season, month), part in self._partitions.items():
+            season_dir = os.path.join(directory, f"season={season}")
+            os.makedirs(season_dir, exist_ok=True)
+            part.to_parquet(os.path.join(season_dir, f"month={month:02d}.parquet"), index=False)
+        if self._undated is not None:
+            self._undated.to_parquet(os.path.join(directory, "undated.parquet"), index=False)
+
+    @classmethod
+    def load(cls, directory, start=None, end=None, version=None, player_versions=None):
+        # Read only the partition files that overlap [start, end]
+        lo = partition_key(pd.Timestamp(start)) if start is not None else None
+        hi = partition_key(pd.Timestamp(end)) if end is not None else None
+
+        partitions = {}
+        columns = None
+        for season_dir in sorted(os.listdir(directory)):
+            if not season_dir.startswith("season="):
+                continue
+            season = int(season_dir.split("=", 1)[1])
+            for name in sorted(os.listdir(os.path.join(directory, season_dir))):
+                month = int(name[len("month="):-len(".parquet")])
+                key = (season, month)
+                if (lo is not None and key < lo) or (hi is not None and key > hi):
+                    continue
+                part = pd.read_parquet(os.path.join(directory, season_dir, name))
+                partitions[key] = part
+                columns = part.columns
+
+        undated = None
+        undated_path = os.path.join(directory, "undated.parquet")
+        if start is None and end is None and os.path.exists(undated_path):
+            undated = pd.read_parquet(undated_path)
+            columns = undated.columns if columns is None else columns
+
+        return cls(partitions, undated=undated, columns=columns, version=version, player_versions=player_versions)
@@ -0,0 +1,136 @@
+import logging
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from data_store import group_versions
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# PER-PLAYER DIRTY TRACKING
+# =========================
+# A refresh usually only adds one testing day for a handful of players. Each
+# player, team and metric gets a content hash of just its own rows, and the
+# derived caches key on those instead of the whole-sheet data version:
+#
+#   player views, chart PNGs, report jobs -> store.player_version(player)
+#   leaderboard reads                     -> kept unless the metric changed
+#   team KPI / trend reads                -> kept unless the team changed
+#
+# On refresh the old and new hashes are diffed. Entries for the players that
+# changed are dropped right away instead of lingering until the LRU pushes
+# them out; everything else stays warm.
+
+
+@dataclass(frozen=True)
+class DataChanges:
+    players: frozenset = frozenset()
+    teams: frozenset = frozenset()
+    metrics: frozenset = frozenset()
+    full: bool = False  # nothing to compare against, so everything counts as changed
+
+    def __bool__(self):
+        return self.full or bool(self.players or self.teams or self.metrics)
+
+    def describe(self):
+        if self.full:
+            return "full load"
+        return f"{len(self.players)} players, {len(self.teams)} teams, {len(self.metrics)} metrics changed"
+
+
+def _changed_keys(old, new):
+    return frozenset(key for key in old.keys() | new.keys() if old.get(key) != new.get(key))
+
+
+class Fingerprints:
+    def __init__(self, players, teams, metrics, version=None):
+        # {name: content hash} for each player, team and metric
+        self.players = players
+        self.teams = teams
+        self.metrics = metrics
+        self.version = version
+
+    @classmethod
+    def from_frame(cls, df, version=None):
+        return cls(
+            group_versions(df, "full_name"),
+            group_versions(df, "Team"),
+            group_versions(df, "Metric_Type"),
+            version=version
+        )
+
+    @classmethod
+    def from_table(cls, table, version=None):
+        # Inverse of to_table, e.g. for the copy a snapshot carries
+        groups = {kind: {} for kind in ("player", "team", "metric")}
+        for kind, name, fingerprint in table[["Kind", "Name", "Version"]].itertuples(index=False, name=None):
+            groups[kind][name] = fingerprint
+        return cls(groups["player"], groups["team"], groups["metric"], version=version)
+
+    def to_table(self):
+        rows = [
+            (kind, name, fingerprint)
+            for kind, versions in (("player", self.players), ("team", self.teams), ("metric", self.metrics))
+            for name, fingerprint in versions.items()
+        ]
+        return pd.DataFrame(rows, columns=["Kind", "Name", "Version"])
+
+    def diff(self, previous):
+        if previous is None:
+            return DataChanges(full=True)
+        return DataChanges(
+            players=_changed_keys(previous.players, self.players),
+            teams=_changed_keys(previous.teams, self.teams),
+            metrics=_changed_keys(previous.metrics, self.metrics)
+        )
+
+
+# ---------------------------
+# INVALIDATION
+# ---------------------------
+def invalidate(changes):
+    # Drop the process-wide entries that belong to changed players. Their new
+    # rows hash differently, so these could never be hit again anyway.
+    from charts import get_renderer
+    from jobs import get_job_queue
+    from view_cache import player_view_cache
+
+    if changes.full or not changes.players:
+        return {}
+    players = changes.players
+    return {
+        "views": player_view_cache.discard(lambda key: key[0] in players),
+        "charts": get_renderer().discard(lambda key: key[0] in players),
+        "reports": get_job_queue().discard(
+            lambda job: isinstance(job.key, tuple) and job.key[:1] == ("player_report",) and job.key[1] in players
+        ),
+    }
+
+
+class DirtyTracker:
+    # Remembers the fingerprints of the last data version this process served
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fingerprints = None
+        self.changes = DataChanges(full=True)
+        self.dropped = {}
+
+    def refresh(self, fingerprints):
+        # Returns what changed since the previous version (once per version)
+        with self._lock:
+            if self.fingerprints is not None and self.fingerprints.version == fingerprints.version:
+                return self.changes
+            changes = fingerprints.diff(self.fingerprints)
+            self.fingerprints = fingerprints
+            self.changes = changes
+            self.dropped = invalidate(changes)
+
+        logger.info(
+            "Data version %s: %s; dropped %s",
+            fingerprints.version,
+            changes.describe(),
+            ", ".join(f"{n} {kind}" for kind, n in self.dropped.items()) or "nothing"
+        )
+        return changes
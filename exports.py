@@ -0,0 +1,226 @@
+import os
+import secrets
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from metrics import age_groups_for, build_leaderboard, build_results_summary, lower_is_better, player_profile
+
+# =========================
+# EXPORT CONFIG
+# =========================
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+PLAYERS_PER_CHUNK = 50
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # spill exports to disk past 8 MB while they're written
+
+# Exports written to disk are downloaded straight from Streamlit's app static
+# route (server.enableStaticServing, see .streamlit/config.toml), which sends
+# the file from disk in chunks. The route refuses files over 200 MB.
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "exports")
+EXPORT_URL_PREFIX = "app/static/exports"
+EXPORT_TTL_SECONDS = 60 * 60
+STATIC_MAX_BYTES = 200 * 1024 * 1024
+
+SUMMARY_COLUMNS = ["Player", "Team", "Age Group", "Metric", "First", "Latest", "Best", "Growth", "Goal"]
+LEADERBOARD_COLUMNS = ["Metric", "Rank", "full_name", "Age", "Best"]
+
+
+# =========================
+# EXPORT SOURCES
+# =========================
+# Each source yields DataFrame chunks so writers never hold the whole export.
+
+def iter_raw_rows(store, start=None, end=None, team=None, age_group=None):
+    filters = {"Team": team} if team else {}
+    for chunk in store.iter_partitions(start, end, **filters):
+        if age_group:
+            chunk = chunk[age_groups_for(chunk["Age"]) == age_group]
+        if not chunk.empty:
+            yield chunk
+
+
+def iter_player_summaries(store, start=None, end=None, team=None, age_group=None):
+    # Only the names are read up front; each batch of PLAYERS_PER_CHUNK players
+    # is then scanned on its own, so one batch's rows are held at a time
+    filters = {"Team": team} if team else {}
+    players = sorted(store.scan(start, end, columns=["full_name"], **filters)["full_name"].dropna().unique())
+
+    for i in range(0, len(players), PLAYERS_PER_CHUNK):
+        rows = store.scan(start, end, full_name=players[i:i + PLAYERS_PER_CHUNK], **filters)
+
+        batch = []
+        for player, player_df in rows.groupby("full_name", sort=True):
+            _, player_team, player_age_group = player_profile(player_df)
+            if age_group and player_age_group != age_group:
+                continue
+
+            summary = build_results_summary(player_df, player_age_group)
+            summary.insert(0, "Age Group", player_age_group)
+            summary.insert(0, "Team", player_team)
+            summary.insert(0, "Player", player)
+            batch.append(summary)
+
+        if batch:
+            yield pd.concat(batch, ignore_index=True)
+
+
+def iter_leaderboards(store, start=None, end=None, team=None, age_group=None):
+    metrics = sorted(store.scan(start, end, columns=["Metric_Type"])["Metric_Type"].dropna().unique())
+    for metric in metrics:
+        filters = {"Metric_Type": metric}
+        if team:
+            filters["Team"] = team
+        metric_df = store.scan(start, end, **filters)
+        if age_group:
+            metric_df = metric_df[age_groups_for(metric_df["Age"]) == age_group]
+        if metric_df.empty:
+            continue
+        yield leaderboard_table(metric_df, metric)
+
+
+def leaderboard_table(metric_df, metric, max_age=None):
+    # build_leaderboard in the LEADERBOARD_COLUMNS layout, ranked from 1
+    leaderboard = build_leaderboard(metric_df, metric, max_age)
+    value_col = "Lowest" if metric in lower_is_better else "Highest"
+    leaderboard = leaderboard.rename(columns={value_col: "Best"})
+    leaderboard.insert(0, "Rank", range(1, len(leaderboard) + 1))
+    leaderboard.insert(0, "Metric", metric)
+    return leaderboard[LEADERBOARD_COLUMNS].reset_index(drop=True)
+
+
+EXPORT_SOURCES = {
+    "Raw Rows": (iter_raw_rows, None),
+    "Player Summaries": (iter_player_summaries, SUMMARY_COLUMNS),
+    "Leaderboards": (iter_leaderboards, LEADERBOARD_COLUMNS),
+}
+
+
+# =========================
+# STREAMING WRITERS
+# =========================
+def write_csv(chunks, fileobj):
+    header = True
+    for chunk in chunks:
+        fileobj.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+
+
+def write_parquet(chunks, fileobj):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in chunks:
+        # Later chunks are cast to the first chunk's schema (one row group each)
+        table = pa.Table.from_pandas(
+            chunk,
+            schema=writer.schema if writer is not None else None,
+            preserve_index=False
+        )
+        if writer is None:
+            writer = pq.ParquetWriter(fileobj, table.schema)
+        writer.write_table(table)
+
+    if writer is not None:
+        writer.close()
+
+
+def write_excel(chunks, fileobj):
+    from openpyxl import Workbook
+
+    # write_only workbooks stream rows out instead of keeping cell objects
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Export")
+
+    header = True
+    for chunk in chunks:
+        if header:
+            ws.append(list(chunk.columns))
+            header = False
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(list(row))
+
+    wb.save(fileobj)
+
+
+WRITERS = {
+    "CSV": write_csv,
+    "Parquet": write_parquet,
+    "Excel": write_excel,
+}
+
+
+# =========================
+# EXPORT ENTRY POINTS
+# =========================
+def iter_export(source, store, start=None, end=None, team=None, age_group=None):
+    iter_source, columns = EXPORT_SOURCES[source]
+    empty = True
+    for chunk in iter_source(store, start, end, team, age_group):
+        empty = False
+        yield chunk
+    if empty:
+        # Keep a header row so empty exports still open cleanly
+        yield pd.DataFrame(columns=columns if columns is not None else store.columns)
+
+
+def write_export(fileobj, source, fmt, store, start=None, end=None, team=None, age_group=None):
+    WRITERS[fmt](iter_export(source, store, start, end, team, age_group), fileobj)
+
+
+def export_file(source, fmt, store, start=None, end=None, team=None, age_group=None):
+    # Write the export under a fresh, unguessable EXPORT_DIR subdirectory and
+    # return its path. Only the chunk being written is held in memory.
+    prune_exports()
+    directory = os.path.join(EXPORT_DIR, secrets.token_urlsafe(16))
+    os.makedirs(directory)
+    path = os.path.join(directory, export_file_name(source, fmt, team, age_group))
+    with open(path + ".part", "wb") as out:
+        write_export(out, source, fmt, store, start, end, team, age_group)
+    os.replace(path + ".part", path)
+    return path
+
+
+def export_url(path):
+    # Relative URL of an export_file path on the app static route
+    return "/".join([EXPORT_URL_PREFIX] + os.path.relpath(path, EXPORT_DIR).split(os.sep))
+
+
+def prune_exports(max_age=EXPORT_TTL_SECONDS):
+    # Drop export directories older than max_age seconds
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def export_bytes(source, fmt, store, start=None, end=None, team=None, age_group=None):
+    # Fallback for servers without static serving: the file is built in chunks
+    # and spills to disk past SPOOL_MAX_BYTES, but st.download_button keeps the
+    # finished payload in its in-memory media storage
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+        write_export(out, source, fmt, store, start, end, team, age_group)
+        out.seek(0)
+        return out.read()
+
+
+def export_file_name(source, fmt, team=None, age_group=None):
+    parts = ["LCB", source.replace(" ", "_")]
+    if team:
+        parts.append(str(team).replace(" ", "_"))
+    if age_group:
+        parts.append(age_group)
+    return "_".join(parts) + EXPORT_FORMATS[fmt][0]
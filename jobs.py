@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# BACKGROUND JOB QUEUE
+# =========================
+# Report rendering runs on a small process-wide thread pool instead of the
+# script thread, so the page stays interactive. Each job has an id, a status
+# and a progress fraction the UI polls. Finished results are kept in memory
+# for JOB_TTL seconds. Submitting the same key again while a job is queued,
+# running or still fresh returns the existing job instead of rendering twice.
+
+REPORT_WORKERS = int(os.environ.get("LCB_REPORT_WORKERS", "2"))
+JOB_TTL = 60 * 60
+MAX_JOBS = 64
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    label: str
+    key: object = None
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = "Waiting for a worker..."
+    result: bytes = None
+    file_name: str = None
+    mime: str = None
+    error: str = None
+    created: float = 0.0
+    finished: float = None
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+
+class JobQueue:
+    def __init__(self, workers=REPORT_WORKERS, ttl=JOB_TTL, max_jobs=MAX_JOBS):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lcb-job")
+        self._jobs = {}  # id -> Job, in submission order
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, label, fn, *args, key=None, file_name=None, mime=None, **kwargs):
+        # fn(progress, *args, **kwargs) -> bytes; progress(fraction, message)
+        with self._lock:
+            self._prune()
+            existing = self._jobs.get(self._by_key.get(key)) if key is not None else None
+            if existing is not None and existing.status != FAILED:
+                return existing.id
+
+            job = Job(
+                id=uuid.uuid4().hex[:12],
+                label=label,
+                key=key,
+                file_name=file_name,
+                mime=mime,
+                created=time.time()
+            )
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+
+        self._pool.submit(self._run, job.id, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, predicate):
+        # Forget finished jobs matching predicate(job); running ones are left alone
+        with self._lock:
+            stale = [job for job in self._jobs.values() if not job.active and predicate(job)]
+            for job in stale:
+                del self._jobs[job.id]
+                if self._by_key.get(job.key) == job.id:
+                    del self._by_key[job.key]
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            counts["bytes"] = sum(len(job.result) for job in self._jobs.values() if job.result)
+            return counts
+
+    # ---------------------------
+    # WORKER SIDE
+    # ---------------------------
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs[job_id] = replace(job, **changes)
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._update(job_id, status=RUNNING, message="Starting...")
+
+        def progress(fraction, message=None):
+            changes = {"progress": max(0.0, min(1.0, fraction))}
+            if message is not None:
+                changes["message"] = message
+            self._update(job_id, **changes)
+
+        try:
+            result = fn(progress, *args, **kwargs)
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            self._update(job_id, status=FAILED, error=str(e), message="Failed", finished=time.time())
+            return
+        self._update(job_id, status=DONE, progress=1.0, message="Done", result=result, finished=time.time())
+
+    def _prune(self):
+        # Drop expired results, then the oldest finished jobs past max_jobs
+        now = time.time()
+        finished = [job for job in self._jobs.values() if not job.active]
+        expired = {job.id for job in finished if now - job.finished > self.ttl}
+        overflow = len(self._jobs) - len(expired) - self.max_jobs
+        if overflow > 0:
+            expired.update(job.id for job in finished[:overflow] if job.id not in expired)
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+
+# =========================
+# REPORT JOBS
+# =========================
+def player_report_job(progress, player_name, player_df, age_group, team, coach_notes="",
+                      data_version=None, window=None, prebuilt_path=None):
+    # Returns the PDF bytes; the temp file is removed once it has been read
+    if prebuilt_path is not None:
+        progress(0.5, "Loading nightly report...")
+        with open(prebuilt_path, "rb") as f:
+            return f.read()
+
+    from charts import get_renderer
+    from reports import create_player_summary_pdf
+
+    progress(0.1, "Rendering charts...")
+    chart_images = get_renderer().render_player_charts(player_name, player_df, data_version, window=window)
+
+    progress(0.6, "Building PDF...")
+    pdf_path = create_player_summary_pdf(player_name, player_df, age_group, team, coach_notes, chart_images)
+    try:
+        with open(pdf_path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(pdf_path)
+
+
+def submit_player_report(views, player_name, coach_notes="", window=(None, None), data_version=None,
+                         prebuilt_path=None):
+    # The Player tab and the warm-up submit through here, so both use the same
+    # job key and a pre-rendered report is picked up by the next click.
+    # data_version is the player's own version (store.player_version), so a
+    # finished report stays valid until that player's rows change.
+    from snapshot import report_file_name
+
+    return get_job_queue().submit(
+        f"{player_name} Report",
+        player_report_job,
+        player_name,
+        views.player_df,
+        views.age_group,
+        views.player_team,
+        coach_notes,
+        data_version=data_version,
+        window=tuple(window),
+        prebuilt_path=prebuilt_path,
+        key=("player_report", player_name, coach_notes, tuple(window), data_version),
+        file_name=report_file_name(player_name),
+        mime="application/pdf"
+    )
@@ -0,0 +1,170 @@
+import logging
+import os
+from dataclasses import dataclass
+from functools import partial
+
+import streamlit as st
+
+from aggregates import AggregateState
+from data_store import PartitionedStore
+from dirty import DataChanges, DirtyTracker, Fingerprints
+from search import PlayerIndex
+from sheets import SheetSource
+from snapshot import Snapshot, read_manifest
+from warmup import ViewCounter, Warmup
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# LOAD GOOGLE SHEETS
+# =========================
+# The sheet's revision is checked at most once a minute; the full download only
+# runs when that version token changes. Caches downstream key on data_version.
+# With LCB_SNAPSHOT_DIR set, data comes from the nightly snapshot written by
+# `python cli.py snapshot` and Google Sheets is never contacted. The running
+# aggregates (leaderboards, team KPIs and trends, all-time summaries) and the
+# per-player fingerprints are then restored from the snapshot's tables rather
+# than recomputed from the rows.
+#
+# These live outside dashboard.py so the server start hook in app.py fills the
+# same process-wide caches the dashboard reads.
+DATA_VERSION_TTL = 60
+SNAPSHOT_DIR = os.environ.get("LCB_SNAPSHOT_DIR")
+
+@st.cache_resource
+def get_sheet_source():
+    return SheetSource(st.secrets["gcp_service_account"])
+
+@st.cache_data(ttl=DATA_VERSION_TTL)
+def get_data_version():
+    if SNAPSHOT_DIR:
+        return read_manifest(SNAPSHOT_DIR)["version"]
+    return get_sheet_source().data_version()
+
+@st.cache_resource(max_entries=2)
+def get_snapshot(data_version):
+    return Snapshot(SNAPSHOT_DIR, data_version)
+
+# The snapshot's store is already partitioned, so it's loaded as is
+@st.cache_resource(max_entries=2)
+def get_snapshot_store(data_version):
+    snapshot = get_snapshot(data_version)
+    fingerprints = snapshot.fingerprints()
+    return snapshot.store(player_versions=fingerprints.players if fingerprints else None)
+
+# The frame is held once per process and shared by every session instead of
+# being deserialized into a fresh copy on each rerun. Treat it as read-only:
+# tabs take filtered views of it (pandas copy-on-write keeps those cheap) and
+# never assign into it.
+@st.cache_resource(max_entries=2)
+def load_data(data_version):
+    if SNAPSHOT_DIR:
+        return get_snapshot_store(data_version).scan()
+    return get_sheet_source().fetch_frame()
+
+# Per-player / team / metric content hashes (see dirty.py)
+@st.cache_resource(max_entries=2)
+def get_fingerprints(data_version, _df):
+    fingerprints = get_snapshot(data_version).fingerprints() if SNAPSHOT_DIR else None
+    return fingerprints or Fingerprints.from_frame(_df, data_version)
+
+@st.cache_resource(max_entries=2)
+def load_store(data_version, _df):
+    if SNAPSHOT_DIR:
+        return get_snapshot_store(data_version)
+    fingerprints = get_fingerprints(data_version, _df)
+    return PartitionedStore.from_frame(_df, version=data_version, player_versions=fingerprints.players)
+
+# Filter choices only change with the data, not per rerun
+@st.cache_resource(max_entries=2)
+def get_filter_options(data_version, _df):
+    return {
+        "teams": sorted(_df["Team"].dropna().unique()),
+        "metrics": sorted(_df["Metric_Type"].unique()),
+        "ages": sorted(_df["Age"].unique()),
+    }
+
+@st.cache_resource(max_entries=2)
+def get_player_index(data_version, _df):
+    return PlayerIndex.from_frame(_df, version=data_version)
+
+# On a new data version only the caches of players, teams and metrics whose
+# rows changed are invalidated
+@st.cache_resource
+def get_dirty_tracker():
+    return DirtyTracker()
+
+# Running aggregates only fold in rows appended since the last version
+@st.cache_resource
+def get_aggregates():
+    return AggregateState()
+
+def refresh_aggregates(state, snapshot, df, version, changes):
+    tables = snapshot.aggregate_tables() if snapshot is not None else None
+    if tables is not None:
+        state.load_tables(tables, version, changes)
+    else:
+        state.update(df, version, changes)
+
+# The aggregates are brought up to date, then leaderboards, team reads and
+# popular players are precomputed, on a background thread once per data
+# version (see warmup.py)
+@st.cache_resource
+def get_view_counter():
+    return ViewCounter()
+
+@st.cache_resource(max_entries=1)
+def start_warmup(data_version, _store, _aggregates, _options, _refresh):
+    return Warmup(_store, _aggregates, _options, get_view_counter(), _refresh).start()
+
+
+# =========================
+# LOADED DATA
+# =========================
+@dataclass(frozen=True)
+class LoadedData:
+    data_version: str
+    df: object
+    store: PartitionedStore
+    options: dict
+    changes: DataChanges
+    aggregate_state: AggregateState
+    warmup: Warmup
+
+
+def load(data_version):
+    # Everything a rerun reads before it renders, with the warm-up started.
+    # Each step is a process-wide cache, so only the first call per data
+    # version does any work.
+    df = load_data(data_version)
+    store = load_store(data_version, df)
+    options = get_filter_options(data_version, df)
+    changes = get_dirty_tracker().refresh(get_fingerprints(data_version, df))
+    aggregate_state = get_aggregates()
+    warmup = start_warmup(
+        data_version,
+        store,
+        aggregate_state,
+        options,
+        partial(
+            refresh_aggregates,
+            aggregate_state,
+            get_snapshot(data_version) if SNAPSHOT_DIR else None,
+            df,
+            data_version,
+            changes
+        )
+    )
+    return LoadedData(data_version, df, store, options, changes, aggregate_state, warmup)
+
+
+def load_at_startup():
+    # Called from the server start hook (app.py), before any session exists
+    try:
+        loaded = load(get_data_version())
+        get_player_index(loaded.data_version, loaded.df)
+    except Exception:
+        logger.warning("Startup load failed; the first session will load the data", exc_info=True)
+        return None
+    logger.info("Startup load of %s done; warm-up %s", loaded.data_version, loaded.warmup.status)
+    return loaded
@@ -0,0 +1,208 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import FIRST_NAMES, LAST_NAMES, synthetic_snapshot
+
+# =========================
+# CONCURRENT-SESSION LOAD TEST
+# =========================
+# Drives dashboard.py with Streamlit's headless AppTest from N threads at once,
+# all in this process, so they share the same cache_resource objects the way
+# real sessions share one server. Data comes from a snapshot, so there is no
+# Google access:
+#
+#   python loadtest.py --players 500 --sessions 1,4,8,16 --actions 20
+#   python loadtest.py --snapshot /srv/lcb/snapshot --sessions 8
+#
+# Each level reports rerun latency percentiles, reruns per second and the peak
+# process RSS seen while it ran.
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+RSS_SAMPLE_SECONDS = 0.05
+
+
+# =========================
+# SESSIONS
+# =========================
+def _widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    return None
+
+
+def _pick(rnd, widget):
+    if widget is None or not widget.options:
+        return False
+    widget.select_index(rnd.randrange(len(widget.options)))
+    return True
+
+
+def _search(rnd, widget):
+    if widget is None:
+        return False
+    widget.input(rnd.choice(["", "", rnd.choice(FIRST_NAMES)[:3], rnd.choice(LAST_NAMES)[:2]]))
+    return True
+
+
+# Interactions a coach or parent makes; each is followed by one rerun
+ACTIONS = {
+    "player": lambda rnd, at: _pick(rnd, _widget(at, "selectbox", "Select Player")),
+    "search": lambda rnd, at: _search(rnd, _widget(at, "text_input", "Search Players")),
+    "team": lambda rnd, at: _pick(rnd, _widget(at, "selectbox", "Select Team")),
+    "metric": lambda rnd, at: _pick(rnd, _widget(at, "selectbox", "Select Metric")),
+    "age": lambda rnd, at: _pick(rnd, _widget(at, "selectbox", "Filter by Age")),
+}
+
+
+class SessionResult:
+    def __init__(self):
+        self.latencies = []  # (action, seconds)
+        self.errors = []
+
+
+def run_session(session_id, actions, seed, timeout, start_barrier, result):
+    from streamlit.testing.v1 import AppTest
+
+    rnd = random.Random(seed * 1000 + session_id)
+    at = AppTest.from_file(DASHBOARD, default_timeout=timeout)
+    start_barrier.wait()
+
+    def timed_run(action):
+        started = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            result.errors.append(f"{action}: {e!r}")
+            return
+        result.latencies.append((action, time.perf_counter() - started))
+        result.errors.extend(f"{action}: {exc.value}" for exc in at.exception)
+
+    timed_run("initial")
+    for _ in range(actions):
+        action = rnd.choice(list(ACTIONS))
+        if ACTIONS[action](rnd, at):
+            timed_run(action)
+
+
+class RSSSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        from memory import rss_bytes
+
+        while not self._stop_event.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, rss_bytes() or 0)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_level(sessions, actions, seed, timeout):
+    results = [SessionResult() for _ in range(sessions)]
+    barrier = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(target=run_session, args=(i, actions, seed, timeout, barrier, results[i]), daemon=True)
+        for i in range(sessions)
+    ]
+    sampler = RSSSampler()
+    sampler.start()
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    sampler.stop()
+
+    latencies = [seconds for r in results for _, seconds in r.latencies]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": sum(len(r.errors) for r in results),
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else np.nan,
+        "reruns_per_s": len(latencies) / elapsed if elapsed else np.nan,
+        "peak_rss_mb": sampler.peak / (1024 * 1024),
+        "first_errors": [e for r in results for e in r.errors][:3],
+    }
+
+
+# =========================
+# ENTRY POINT
+# =========================
+def build_parser():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for dashboard.py")
+    parser.add_argument("--snapshot", help="existing snapshot root (default: generate synthetic data)")
+    parser.add_argument("--players", type=int, default=200, help="synthetic players")
+    parser.add_argument("--seasons", type=int, default=2, help="synthetic seasons of testing days")
+    parser.add_argument("--sessions", default="1,2,4,8", help="comma-separated concurrent session counts")
+    parser.add_argument("--actions", type=int, default=15, help="interactions per session")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--csv", help="also write the results table to this CSV file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    levels = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    if args.snapshot:
+        root = args.snapshot
+        print(f"Using snapshot {root}")
+    else:
+        root, rows = synthetic_snapshot(args.players, args.seasons, args.seed)
+        print(f"Synthetic snapshot: {args.players} players, {rows} rows in {root}")
+
+    try:
+        return run_levels(root, levels, args)
+    finally:
+        if not args.snapshot:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def run_levels(root, levels, args):
+    # The dashboard reads these when each AppTest session executes it
+    os.environ["LCB_SNAPSHOT_DIR"] = root
+    os.environ.setdefault("LCB_MEMORY_LOG", "0")
+
+    # One untimed session warms the process-wide caches, as a running server would be
+    run_level(1, 0, args.seed, args.timeout)
+
+    rows = []
+    for sessions in levels:
+        row = run_level(sessions, args.actions, args.seed, args.timeout)
+        rows.append(row)
+        print(
+            f"{sessions:>4} sessions  {row['reruns']:>5} reruns  "
+            f"p50 {row['p50_ms']:7.0f}ms  p95 {row['p95_ms']:7.0f}ms  p99 {row['p99_ms']:7.0f}ms  "
+            f"{row['reruns_per_s']:6.2f} reruns/s  peak RSS {row['peak_rss_mb']:7.1f}MB  errors {row['errors']}"
+        )
+        for error in row["first_errors"]:
+            print(f"      {error}")
+
+    if args.csv:
+        pd.DataFrame(rows).drop(columns=["first_errors"]).to_csv(args.csv, index=False)
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
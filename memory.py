@@ -0,0 +1,221 @@
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+from view_cache import estimate_size
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# MEMORY ACCOUNTING
+# =========================
+# Every rerun keeps a MemoryLedger of the frames and figures each section
+# touched, alongside the process-wide caches. The ledger is logged as one line
+# at the end of the run and shown in full with ?admin=memory.
+#
+# Set LCB_TRACEMALLOC=1 to also trace Python allocations (slower; peaks are
+# process-wide, so concurrent sessions show up in each other's numbers).
+
+TRACEMALLOC = os.environ.get("LCB_TRACEMALLOC") == "1"
+TRACEMALLOC_FRAMES = 1
+TOP_ALLOCATIONS = 15
+
+
+def setup():
+    # Streamlit leaves the root logger unconfigured, so the per-rerun line gets
+    # its own handler (silence it with LCB_MEMORY_LOG=0)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO if os.environ.get("LCB_MEMORY_LOG", "1") != "0" else logging.WARNING)
+        logger.propagate = False
+
+    if TRACEMALLOC and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+def format_bytes(n):
+    if n is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.1f}{unit}" if unit != "B" else f"{n}B"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+# ---------------------------
+# PROCESS
+# ---------------------------
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KB on Linux
+
+
+# ---------------------------
+# SIZES
+# ---------------------------
+def deep_sizeof(obj, _seen=None):
+    # Recursive getsizeof for plain containers; frames use pandas' own count
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return estimate_size(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def figure_size(fig):
+    # Data arrays held by a Plotly figure's traces
+    total = 0
+    for trace in fig.data:
+        for attr in ("x", "y", "customdata", "text", "hovertext"):
+            value = getattr(trace, attr, None)
+            if value is None:
+                continue
+            total += value.nbytes if hasattr(value, "nbytes") else deep_sizeof(value)
+    return total
+
+
+def sizeof(value):
+    if hasattr(value, "data") and hasattr(value, "layout") and hasattr(value, "to_plotly_json"):
+        return figure_size(value)
+    return estimate_size(value)
+
+
+# ---------------------------
+# PROCESS-WIDE CACHES
+# ---------------------------
+# The loaded frame, store, aggregates and search index only change with the
+# data version, so their deep sizes are computed once per version.
+_static_sizes = {}
+_static_lock = threading.Lock()
+
+
+def _static_size(name, version, measure):
+    with _static_lock:
+        key = (name, version)
+        if key not in _static_sizes:
+            for stale in [k for k in _static_sizes if k[0] == name]:
+                del _static_sizes[stale]
+            _static_sizes[key] = measure()
+        return _static_sizes[key]
+
+
+def cache_sizes(version, df=None, store=None, aggregates=None, player_index=None):
+    from charts import get_renderer
+    from jobs import get_job_queue
+    from view_cache import player_view_cache
+
+    sizes = {}
+    if df is not None:
+        sizes["Loaded frame"] = _static_size("frame", version, lambda: estimate_size(df))
+    if store is not None:
+        sizes["Partitioned store"] = _static_size("store", version, store.memory_usage)
+    if aggregates is not None:
+        sizes["Running aggregates"] = _static_size(
+            "aggregates", version,
+            lambda: deep_sizeof([aggregates.player_metrics, aggregates.leaderboards, aggregates.team_daily])
+        )
+    if player_index is not None:
+        sizes["Search index"] = _static_size("index", version, lambda: deep_sizeof(player_index))
+    sizes["Player views LRU"] = player_view_cache.stats()["bytes"]
+    sizes["Chart PNG cache"] = get_renderer().stats()["bytes"]
+    sizes["Report job results"] = get_job_queue().stats()["bytes"]
+    return sizes
+
+
+def temp_pdfs():
+    # (count, bytes) of report PDFs left in the temp directory
+    reports = sys.modules.get("reports")
+    if reports is None:
+        return 0, 0
+    count = total = 0
+    with os.scandir(tempfile.gettempdir()) as entries:
+        for entry in entries:
+            if entry.name.startswith(reports.TEMP_PDF_PREFIX) and entry.is_file():
+                count += 1
+                total += entry.stat().st_size
+    return count, total
+
+
+# =========================
+# PER-RERUN LEDGER
+# =========================
+class MemoryLedger:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sections = {}  # section -> {kind: bytes}
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def record(self, section, kind, *values):
+        sizes = self.sections.setdefault(section, {})
+        sizes[kind] = sizes.get(kind, 0) + sum(sizeof(v) for v in values if v is not None)
+
+    def section_totals(self):
+        return {section: sum(kinds.values()) for section, kinds in self.sections.items()}
+
+    def section_frame(self):
+        rows = [
+            (section, kind, size)
+            for section, kinds in self.sections.items()
+            for kind, size in kinds.items()
+        ]
+        return pd.DataFrame(rows, columns=["Section", "Kind", "Bytes"])
+
+    def traced(self):
+        # (current, peak) traced bytes, or (None, None) when tracemalloc is off
+        if not tracemalloc.is_tracing():
+            return None, None
+        return tracemalloc.get_traced_memory()
+
+    def log(self, caches):
+        current, peak = self.traced()
+        logger.info(
+            "rerun %.2fs rss=%s peak_rss=%s caches=%s sections=[%s]%s",
+            time.perf_counter() - self.started,
+            format_bytes(rss_bytes()),
+            format_bytes(peak_rss_bytes()),
+            format_bytes(sum(caches.values())),
+            " ".join(f"{s}={format_bytes(b)}" for s, b in self.section_totals().items()),
+            f" traced={format_bytes(current)} traced_peak={format_bytes(peak)}" if current is not None else ""
+        )
+
+
+def top_allocations(limit=TOP_ALLOCATIONS):
+    if not tracemalloc.is_tracing():
+        return pd.DataFrame(columns=["Location", "Bytes", "Blocks"])
+    stats = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+    return pd.DataFrame(
+        [(str(stat.traceback[0]), stat.size, stat.count) for stat in stats],
+        columns=["Location", "Bytes", "Blocks"]
+    )
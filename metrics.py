@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+# =========================
+# CONFIG
+# =========================
+lower_is_better = {"10 yard sprint", "Pro Agility", "Home to 1B sprint"}
+
+# --- Metric Groups ---
+baseball_metrics = [
+    "Arm Speed Pitch", "Arm Speed Reg",
+    "BES Flip", "BES Tee"
+]
+
+speed_metrics = [
+    "10 yard sprint", "Pro Agility"
+]
+
+targets = {
+    "8U": {
+        "Bench": 45, "Squat": 70, "Pull Ups": 2, "Wall Sit": 30, "Plank": 30, "Push Ups": 5,
+        "10 yard sprint": 2.8, "Pro Agility": 5.8, "Home to 1B sprint": 6.0,
+        "Arm Speed Pitch": 30, "Arm Speed Reg": 35, "BES Flip": 50, "BES Tee": 45, "Broad Jump": 5
+    },
+    "10U": {
+        "Bench": 65, "Squat": 90, "Pull Ups": 4, "Wall Sit": 60, "Plank": 45, "Push Ups": 10,
+        "10 yard sprint": 2.3, "Pro Agility": 5.2, "Home to 1B sprint": 5.2,
+        "Arm Speed Pitch": 40, "Arm Speed Reg": 45, "BES Flip": 60, "BES Tee": 55, "Broad Jump": 6
+    },
+    "12U": {
+        "Bench": 90, "Squat": 120, "Pull Ups": 6, "Wall Sit": 90, "Plank": 60, "Push Ups": 15,
+        "10 yard sprint": 2.0, "Pro Agility": 4.9, "Home to 1B sprint": 5.0,
+        "Arm Speed Pitch": 50, "Arm Speed Reg": 55, "BES Flip": 65, "BES Tee": 60, "Broad Jump": 7
+    },
+    "14U": {
+        "Bench": 120, "Squat": 135, "Pull Ups": 8, "Wall Sit": 120, "Plank": 90, "Push Ups": 20,
+        "10 yard sprint": 1.9, "Pro Agility": 4.8, "Home to 1B sprint": 4.8,
+        "Arm Speed Pitch": 60, "Arm Speed Reg": 65, "BES Flip": 75, "BES Tee": 70, "Broad Jump": 7.5
+    },
+    "16U": {
+        "Bench": 135, "Squat": 180, "Pull Ups": 10, "Wall Sit": 180, "Plank": 120, "Push Ups": 25,
+        "10 yard sprint": 1.7, "Pro Agility": 4.7, "Home to 1B sprint": 4.3,
+        "Arm Speed Pitch": 70, "Arm Speed Reg": 75, "BES Flip": 90, "BES Tee": 80, "Broad Jump": 9
+    }
+}
+
+def get_age_group(age):
+    if age <= 8: return "8U"
+    elif age <= 10: return "10U"
+    elif age <= 12: return "12U"
+    elif age <= 14: return "14U"
+    return "16U"
+
+# =========================
+# Player Hitting Grades
+# =========================
+def get_hitting_grade(player_df, age_group):
+    goals = targets.get(age_group, {})
+
+    if "BES Tee" not in goals:
+        return "—", None
+
+    goal = goals["BES Tee"]
+
+    if "BES Tee" not in player_df["Metric_Type"].values:
+        return "—", None
+
+    best = (
+        player_df[player_df["Metric_Type"] == "BES Tee"]["Highest"].max()
+    )
+
+    diff = goal - best  # how far from goal
+
+    # Grade logic
+    if diff <= 8:
+        grade = "A"
+    elif diff <= 12:
+        grade = "B"
+    elif diff <= 15:
+        grade = "C"
+    else:
+        grade = "D"
+
+    # mph to A (0 if already an A)
+    mph_to_a = max(0, diff)
+
+    return grade, round(mph_to_a, 1)
+
+# =========================
+# Player Speed Grade
+# =========================
+def get_speed_grade(player_df, age_group):
+    speed_metrics = ["10 yard sprint", "Pro Agility", "Home to 1B sprint"]
+    goals = targets.get(age_group, {})
+    diffs = []
+
+    for metric in speed_metrics:
+        if metric not in player_df["Metric_Type"].values:
+            continue
+        if metric not in goals:
+            continue
+
+        best = (
+            player_df[player_df["Metric_Type"] == metric]["Lowest"].min()
+        )
+
+        diff = best - goals[metric]  # positive = slower
+        diffs.append(diff)
+
+    if not diffs:
+        return "—", None
+
+    avg_diff = sum(diffs) / len(diffs)
+
+    # Grade logic (seconds from goal)
+    if avg_diff <= 0.10:
+        grade = "A"
+    elif avg_diff <= 0.15:
+        grade = "B"
+    elif avg_diff <= 0.25:
+        grade = "C"
+    else:
+        grade = "D"
+
+    sec_to_a = max(0, avg_diff)
+
+    return grade, round(sec_to_a, 2)
+
+
+# =========================
+# PLAYER PROFILE
+# =========================
+AGE_GROUPS = list(targets)
+
+def age_groups_for(ages):
+    # Vectorised get_age_group for a column of ages (missing ages stay missing)
+    groups = pd.cut(ages, bins=[-np.inf, 8, 10, 12, 14, np.inf], labels=AGE_GROUPS)
+    return groups.astype(object)
+
+def player_profile(player_df):
+    most_recent = player_df.sort_values("Date").iloc[-1]
+    player_age = int(most_recent["Age"]) if not pd.isna(most_recent["Age"]) else None
+    player_team = most_recent["Team"] if str(most_recent["Team"]) != "nan" else "N/A"
+    age_group = get_age_group(player_age) if player_age else "N/A"
+    return player_age, player_team, age_group
+
+# =========================
+# DERIVED TABLES
+# =========================
+SUMMARY_NUMERIC_COLS = ["First", "Latest", "Best", "Growth", "Goal"]
+
+def summary_record(metric, first, latest, best, age_group):
+    growth = first - best if metric in lower_is_better else best - first
+    goal = targets.get(age_group, {}).get(metric, None)
+    return {
+        "Metric": metric,
+        "First": first,
+        "Latest": latest,
+        "Best": best,
+        "Growth": growth,
+        "Goal": goal
+    }
+
+def summary_frame(rows):
+    summary_df = pd.DataFrame(rows, columns=["Metric"] + SUMMARY_NUMERIC_COLS)
+    summary_df[SUMMARY_NUMERIC_COLS] = summary_df[SUMMARY_NUMERIC_COLS].apply(pd.to_numeric, errors="coerce")
+    return summary_df
+
+GOAL_MET = "✅ Goal met"
+GOAL_MISSED = "❌ Below goal"
+
+def with_goal_status(summary_df):
+    # Status column for the Best value against the age group's goal, computed per column
+    lower = summary_df["Metric"].isin(lower_is_better)
+    best, goal = summary_df["Best"], summary_df["Goal"]
+    met = (lower & (best <= goal)) | (~lower & (best >= goal))
+    status = pd.Series("", index=summary_df.index, dtype=object)
+    status[goal.notna() & met] = GOAL_MET
+    status[goal.notna() & ~met] = GOAL_MISSED
+    return summary_df.assign(Status=status)
+
+def build_results_summary(player_df, age_group):
+    # First, latest, best and growth per metric for one player
+    rows = []
+    for metric in player_df["Metric_Type"].unique():
+        mdf = player_df[player_df["Metric_Type"] == metric].sort_values("Date")
+
+        if metric in lower_is_better:
+            first = mdf["Lowest"].iloc[0] if "Lowest" in mdf else mdf["Average"].iloc[0]
+            latest = mdf["Lowest"].iloc[-1] if "Lowest" in mdf else mdf["Average"].iloc[-1]
+            best = mdf["Lowest"].min()
+        else:
+            first = mdf["Highest"].iloc[0] if "Highest" in mdf else mdf["Average"].iloc[0]
+            latest = mdf["Highest"].iloc[-1] if "Highest" in mdf else mdf["Average"].iloc[-1]
+            best = mdf["Highest"].max()
+
+        rows.append(summary_record(metric, first, latest, best, age_group))
+
+    return summary_frame(rows)
+
+def build_best_table(player_df):
+    summary_data = []
+    for metric in player_df["Metric_Type"].unique():
+        df_metric = player_df[player_df["Metric_Type"] == metric]
+        best_score = df_metric["Lowest"].min() if metric in lower_is_better else df_metric["Highest"].max()
+        summary_data.append({"Metric": metric, "Best Score": best_score})
+
+    best_df = pd.DataFrame(summary_data, columns=["Metric", "Best Score"])
+    best_df["Best Score"] = pd.to_numeric(best_df["Best Score"], errors="coerce")
+    return best_df
+
+def build_top_performers(team_df, metric, limit=10):
+    metric_df = team_df[team_df["Metric_Type"] == metric]
+
+    # Determine whether to use max or min based on metric type
+    top_players_metric = metric_df.groupby("player_id").agg({
+        "Player_name_first": "first",
+        "Player_name_last": "first",
+        "Average": "min" if metric in lower_is_better else "max"
+    }).reset_index()
+
+    top_players_metric["Full Name"] = top_players_metric["Player_name_first"] + " " + top_players_metric["Player_name_last"]
+    top_players_metric = top_players_metric.sort_values("Average", ascending=(metric in lower_is_better))
+    return top_players_metric[["Full Name", "Average"]].head(limit)
+
+def build_leaderboard(df, metric, max_age=None):
+    if max_age is not None:
+        df = df[df["Age"] <= int(max_age)]
+
+    df_metric = df[df["Metric_Type"] == metric].sort_values("Date", kind="stable")
+
+    # Best Average per player (lowest is better for timed metrics), with the
+    # age from the player's most recent test
+    lower = metric in lower_is_better
+    values = df_metric.groupby("full_name")["Average"].agg("min" if lower else "max")
+    latest_age = df_metric.drop_duplicates("full_name", keep="last").set_index("full_name")["Age"]
+
+    value_col = "Lowest" if lower else "Highest"
+    leaderboard = pd.DataFrame({
+        "full_name": values.index,
+        "Age": latest_age.reindex(values.index).to_numpy(),
+        value_col: values.to_numpy()
+    })
+    return leaderboard.sort_values(value_col, ascending=lower)
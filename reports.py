@@ -0,0 +1,440 @@
+import tempfile
+from functools import lru_cache
+from io import BytesIO
+
+from PIL import Image
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+
+from metrics import lower_is_better, targets, get_hitting_grade, get_speed_grade
+
+# The whole PDF stack lives here so the dashboard only imports it when a
+# report is actually requested.
+
+# =========================
+# Progress Bar
+# =========================
+def draw_progress_bar(c, x, y, width, height, progress, fill_color):
+    progress = max(0, min(1, progress))
+
+    # Outline
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(0.5)
+    c.rect(x, y, width, height, stroke=1, fill=0)
+
+    # Fill
+    c.setFillColor(fill_color)
+    c.rect(x, y, width * progress, height, stroke=0, fill=1)
+
+def hitting_progress(mph_to_a):
+    MAX_MPH = 15
+    if mph_to_a is None:
+        return 0
+    return 1 - min(mph_to_a / MAX_MPH, 1)
+
+
+def speed_progress(sec_to_a):
+    MAX_SEC = 0.30
+    if sec_to_a is None:
+        return 0
+    return 1 - min(sec_to_a / MAX_SEC, 1)
+
+def grade_color(grade):
+    return {
+        "A": colors.green,
+        "B": colors.darkgreen,
+        "C": colors.orange,
+        "D": colors.red
+    }.get(grade, colors.black)
+
+
+# =========================
+# PDF Summary
+# =========================
+
+CARD_METRICS = [
+    "10 yard sprint",
+    "Pro Agility",
+    "BES Tee",
+    "BES Flip",
+    "Arm Speed Pitch",
+    "Arm Speed Reg"
+]
+
+
+def draw_scorecard(c, x, y, w, h, metric, first, best, goal, status, growth, trend_up):
+    # Card background
+    c.setFillColor(colors.whitesmoke)
+    c.roundRect(x, y, w, h, 10, fill=1)
+
+    # Border
+    c.setStrokeColor(colors.grey)
+    c.roundRect(x, y, w, h, 10, fill=0)
+
+    # Metric title
+    c.setFont("Helvetica-Bold", 11)
+    c.setFillColor(colors.black)
+    c.drawString(x + 10, y + h - 20, metric)
+
+    # First value
+    c.setFont("Helvetica", 10)
+    c.drawString(x + 10, y + h - 40, f"First: {first:.2f}")
+
+    # Best value
+    c.setFont("Helvetica", 10)
+    c.drawString(x + 10, y + h - 58, f"Best: {best:.2f}")
+
+    # Goal
+    goal_text = f"{goal:.2f}" if goal is not None else "—"
+    c.drawString(x + 10, y + h - 76, f"Goal: {goal_text}")
+
+    # Status
+    status_color = colors.green if status == "Goal Met" else colors.red
+    c.setFillColor(status_color)
+    c.drawString(x + 10, y + h - 94, f"Status: {status}")
+
+    # Trend arrow
+    sign = "+" if growth > 0 else ""
+    arrow = f"{sign}{growth:.2f} ▲" if trend_up else f"{growth:.2f} ▼"
+    arrow_color = colors.green if trend_up else colors.red
+    c.setFillColor(arrow_color)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawRightString(x + w - 10, y + 15, arrow)
+
+
+# =========================
+# PDF STATIC TEMPLATE
+# =========================
+# Everything that is the same on every report page (logo, title, profile box
+# background, coach notes frame, disclaimer, footer) is drawn once per document
+# into form XObjects and referenced from each page; the trend chart page only
+# uses the page frame. Styles, the logo image and the wrapped disclaimer are
+# built once per process.
+
+TEMP_PDF_PREFIX = "lcb_report_"  # lets memory accounting find our temp PDFs
+PDF_LOGO_PATH = "lcb training logo.png"
+PDF_LOGO_PX = 300  # 70pt logo at ~300 dpi
+PAGE_FRAME_FORM = "lcbPageFrame"
+PROFILE_FORM = "lcbProfileFrame"
+
+PROFILE_BOX_Y = LETTER[1] - 192
+PROFILE_BOX_H = 90
+
+NOTES_BOX_X = 40
+NOTES_BOX_Y = 120
+NOTES_BOX_W = 520
+NOTES_BOX_H = 90
+
+DISCLAIMER_TEXT = (
+    "Performance grades and progress indicators are calculated using LCB Training evaluation standards "
+    "based on program benchmarks and national age-group averages.\n\n"
+    "Results may vary based on development, training history, and testing conditions."
+)
+
+
+@lru_cache(maxsize=1)
+def pdf_logo():
+    # Downscale once so each report embeds a print-sized logo, not the full PNG
+    img = Image.open(PDF_LOGO_PATH)
+    img.thumbnail((PDF_LOGO_PX, PDF_LOGO_PX))
+    return ImageReader(img)
+
+
+@lru_cache(maxsize=1)
+def disclaimer_style():
+    return ParagraphStyle(
+        "LCBDisclaimer",
+        fontName="Helvetica",
+        fontSize=8,
+        leading=10,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    )
+
+
+@lru_cache(maxsize=4)
+def disclaimer_paragraph(max_width):
+    paragraph = Paragraph(DISCLAIMER_TEXT.replace("\n", "<br/>"), disclaimer_style())
+    paragraph.wrap(max_width, 100)  # wrap(width, maxHeight)
+    return paragraph
+
+
+def use_form(c, name, draw):
+    # Forms are defined on first use in a document and referenced after that
+    forms = c.__dict__.setdefault("_lcb_forms", set())
+    if name not in forms:
+        c.beginForm(name)
+        draw(c)
+        c.endForm()
+        forms.add(name)
+    c.doForm(name)
+
+
+def draw_page_frame(c):
+    width, height = LETTER
+
+    # ---- LOGO ----
+    c.drawImage(pdf_logo(), 40, height - 90, width=70, height=70, mask="auto")
+
+    # ---- TITLE ----
+    c.setFont("Helvetica-Bold", 20)
+    c.setFillColor(colors.black)
+    c.drawString(160, height - 55, "LCB Training Performance Summary")
+
+    # ---- DISCLAIMER ----
+    max_width = width - 80
+    disclaimer_paragraph(max_width).drawOn(c, (width - max_width) / 2, 55)
+
+    # ---- FOOTER ----
+    c.setFont("Helvetica-Oblique", 6)
+    c.setFillColor(colors.grey)
+    c.drawCentredString(
+        width / 2,
+        30,
+        "Generated by LCB Training Performance Portal • Work Hard. Be Memorable."
+    )
+
+
+def draw_profile_frame(c):
+    # ---- PLAYER PROFILE BOX ----
+    c.setFillColor(colors.whitesmoke)
+    c.rect(40, PROFILE_BOX_Y, 520, PROFILE_BOX_H, stroke=0, fill=1)
+
+    # ---- COACH NOTES BOX ----
+    c.setFillColor(colors.whitesmoke)
+    c.rect(NOTES_BOX_X, NOTES_BOX_Y, NOTES_BOX_W, NOTES_BOX_H, stroke=1, fill=1)
+
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.black)
+    c.drawString(NOTES_BOX_X + 8, NOTES_BOX_Y + NOTES_BOX_H - 20, "Coach Broc Notes:")
+
+
+def draw_static_template(c):
+    use_form(c, PAGE_FRAME_FORM, draw_page_frame)
+    use_form(c, PROFILE_FORM, draw_profile_frame)
+
+
+def draw_trend_page(c, player_name, chart_images):
+    width, height = LETTER
+
+    use_form(c, PAGE_FRAME_FORM, draw_page_frame)
+
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColor(colors.black)
+    c.drawString(40, height - 120, f"{player_name} — Performance Trends")
+
+    chart_w = width - 80
+    y = height - 140
+    for png in chart_images:
+        image = ImageReader(BytesIO(png))
+        img_w, img_h = image.getSize()
+        chart_h = chart_w * img_h / img_w
+        y -= chart_h
+        c.drawImage(image, 40, y, width=chart_w, height=chart_h)
+        y -= 20
+
+    c.showPage()
+
+
+def draw_player_page(c, player_name, player_df, age_group, team, coach_notes="", chart_images=None):
+    width, height = LETTER
+
+    draw_static_template(c)
+
+    # ---- PLAYER PROFILE BOX ----
+    box_y = PROFILE_BOX_Y
+    box_h = PROFILE_BOX_H
+    
+    # Column X positions
+    left_x = 50
+    mid_x = 230
+    right_x = 370
+    top_y = box_y + box_h - 18
+    line_gap = 18
+    
+    # ======================
+    # LEFT: PLAYER INFO
+    # ======================
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColor(colors.black)
+    c.drawString(left_x, top_y, player_name)
+    
+    c.setFont("Helvetica", 10.5)
+    c.drawString(left_x, top_y - line_gap, f"Team: {team}")
+    c.drawString(left_x, top_y - 2 * line_gap, f"Age Group: {age_group}")
+    
+    # Divider
+    c.setStrokeColor(colors.lightgrey)
+    c.line(mid_x - 15, box_y + 8, mid_x - 15, box_y + box_h - 8)
+    
+    # ======================
+    # MIDDLE: GRADES
+    # ======================
+    hit_grade, mph_to_a = get_hitting_grade(player_df, age_group)
+    spd_grade, sec_to_a = get_speed_grade(player_df, age_group)
+    
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.black)
+    c.drawString(mid_x, top_y, "Grades")
+    
+    grade_offset = 26  # extra spacing under "Grades"
+    
+    # Hitting
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColor(grade_color(hit_grade))
+    c.drawString(mid_x, top_y - grade_offset, f"Hitting: {hit_grade}")
+    
+    # Speed
+    c.setFillColor(grade_color(spd_grade))
+    c.drawString(mid_x, top_y - grade_offset - line_gap, f"Speed: {spd_grade}")
+    
+    # Divider
+    c.setStrokeColor(colors.lightgrey)
+    c.line(right_x - 15, box_y + 8, right_x - 15, box_y + box_h - 8)
+    
+    # ======================
+    # RIGHT: PROGRESS BARS
+    # ======================
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.black)
+    c.drawString(right_x, top_y, "Road to A")
+    
+    # Hitting progress
+    c.setFont("Helvetica", 10)
+    c.drawString(
+        right_x,
+        top_y - 20,
+        f"Hitting: {mph_to_a} mph" if mph_to_a is not None else "Hitting: —"
+    )
+    
+    draw_progress_bar(
+        c,
+        right_x,
+        top_y - 20 - 12,
+        width=130,
+        height=8,
+        progress=hitting_progress(mph_to_a),
+        fill_color=grade_color(hit_grade)
+    )
+    
+    # Speed progress
+    c.drawString(
+        right_x,
+        top_y - 20 - line_gap - 12,
+        f"Speed: {sec_to_a} sec" if sec_to_a is not None else "Speed: —"
+    )
+    
+    draw_progress_bar(
+        c,
+        right_x,
+        top_y - 20 - line_gap - 24,
+        width=130,
+        height=8,
+        progress=speed_progress(sec_to_a),
+        fill_color=grade_color(spd_grade)
+    )
+    
+    # ======================
+    # SCORECARDS (MOVED DOWN)
+    # ======================
+    card_width = 250
+    card_height = 110
+    start_x = 40
+    start_y = height - 310   # moved DOWN to avoid overlap
+    gap_x = 20
+    gap_y = 20
+    
+    col = 0
+    row = 0
+
+    for metric in CARD_METRICS:
+        mdf = player_df[player_df["Metric_Type"] == metric]
+        if mdf.empty:
+            continue
+
+        # First & Best values
+        if metric in lower_is_better:
+            best = mdf["Lowest"].min()
+            first = mdf.sort_values("Date")["Lowest"].iloc[0]
+            growth = first - best   # improvement if positive
+            trend_up = growth > 0
+            status = "Goal Met" if targets.get(age_group, {}).get(metric) and best <= targets[age_group][metric] else "Goal Not Met - Keep Working"
+        else:
+            best = mdf["Highest"].max()
+            first = mdf.sort_values("Date")["Highest"].iloc[0]
+            growth = best - first   # improvement if positive
+            trend_up = growth > 0
+            status = "Goal Met" if targets.get(age_group, {}).get(metric) and best >= targets[age_group][metric] else "Goal Not Met - Keep Working"
+
+        goal = targets.get(age_group, {}).get(metric)
+
+        x = start_x + col * (card_width + gap_x)
+        y = start_y - row * (card_height + gap_y)
+
+        draw_scorecard(
+            c,
+            x=x,
+            y=y,
+            w=card_width,
+            h=card_height,
+            metric=metric,
+            first=first,
+            best=best,
+            goal=goal,
+            status=status,
+            growth=growth,
+            trend_up=trend_up
+        )
+
+        col += 1
+        if col > 1:
+            col = 0
+            row += 1
+
+    # ---- COACH NOTES ----
+    # Add wrapped notes inside the template's notes box
+    if coach_notes:
+        from reportlab.lib.utils import simpleSplit
+    
+        c.setFont("Helvetica", 12)
+        c.setFillColor(colors.black)
+    
+        # Wrap text to fit inside box width minus some padding
+        wrapped_lines = simpleSplit(coach_notes, c._fontname, c._fontsize, NOTES_BOX_W - 10)
+    
+        # Center vertically
+        start_y = NOTES_BOX_Y + NOTES_BOX_H - 35  # start below header
+        line_height = 12
+        for line in wrapped_lines:
+            c.drawString(NOTES_BOX_X + 8, start_y, line)
+            start_y -= line_height
+            if start_y < NOTES_BOX_Y + 8:  # stop if we reach bottom of box
+                break
+
+    c.showPage()
+
+    # ---- TREND CHARTS ----
+    if chart_images:
+        draw_trend_page(c, player_name, chart_images)
+
+
+def create_player_summary_pdf(player_name, player_df, age_group, team, coach_notes="", chart_images=None):
+    return create_players_summary_pdf([(player_name, player_df, age_group, team, coach_notes, chart_images)])
+
+
+def create_players_summary_pdf(reports):
+    # reports: iterable of draw_player_page() argument tuples after the canvas
+    temp_file = tempfile.NamedTemporaryFile(delete=False, prefix=TEMP_PDF_PREFIX, suffix=".pdf")
+    c = canvas.Canvas(temp_file.name, pagesize=LETTER)
+
+    for report in reports:
+        draw_player_page(c, *report)
+
+    c.save()
+
+    return temp_file.name
@@ -0,0 +1,128 @@
+import difflib
+from bisect import bisect_left
+
+from metrics import age_groups_for
+
+# =========================
+# PLAYER SEARCH INDEX
+# =========================
+# Built once per data version. Names are kept sorted by their casefolded form,
+# so prefix lookups are two bisects instead of a scan. Every word of a name
+# (first and last) is indexed the same way, so "smi" finds "Jack Smith".
+# Fuzzy matching only runs when the prefix lookups find nothing (after the
+# team and age group facets are applied), e.g. for a misspelled name.
+
+FUZZY_CUTOFF = 0.6
+
+
+def _norm(text):
+    return " ".join(str(text).casefold().split())
+
+
+def _prefix_range(keys, prefix):
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix + "￿")
+    return lo, hi
+
+
+class PlayerIndex:
+    def __init__(self, names, teams, age_groups, version=None):
+        # names/teams/age_groups: parallel sequences, one entry per player
+        order = sorted(range(len(names)), key=lambda i: _norm(names[i]))
+        self.names = [names[i] for i in order]
+        self.teams = [teams[i] for i in order]
+        self.age_groups = [age_groups[i] for i in order]
+        self.version = version
+        self._keys = [_norm(name) for name in self.names]
+
+        tokens = sorted(
+            (token, i)
+            for i, key in enumerate(self._keys)
+            for token in set(key.split())
+        )
+        self._tokens = [token for token, _ in tokens]
+        self._token_ids = [i for _, i in tokens]
+        self._token_set = sorted(set(self._tokens))
+
+        self._by_team = {}
+        self._by_age_group = {}
+        for i, (team, age_group) in enumerate(zip(self.teams, self.age_groups)):
+            self._by_team.setdefault(team, set()).add(i)
+            self._by_age_group.setdefault(age_group, set()).add(i)
+
+    @classmethod
+    def from_frame(cls, df, version=None):
+        # Team and age group come from each player's most recent row, as in player_profile
+        latest = df[df["full_name"].notna()].sort_values("Date", kind="stable")
+        latest = latest.drop_duplicates("full_name", keep="last")
+        teams = latest["Team"].where(latest["Team"].astype(str) != "nan", "N/A")
+        age_groups = age_groups_for(latest["Age"]).fillna("N/A")
+        return cls(latest["full_name"].tolist(), teams.tolist(), age_groups.tolist(), version=version)
+
+    def __len__(self):
+        return len(self.names)
+
+    # ---------------------------
+    # FACETS
+    # ---------------------------
+    def team_facets(self):
+        return {team: len(ids) for team, ids in sorted(self._by_team.items(), key=lambda kv: str(kv[0]))}
+
+    def age_group_facets(self):
+        return {group: len(ids) for group, ids in sorted(self._by_age_group.items(), key=lambda kv: str(kv[0]))}
+
+    def _allowed(self, team=None, age_group=None):
+        allowed = None
+        if team is not None:
+            allowed = self._by_team.get(team, set())
+        if age_group is not None:
+            group_ids = self._by_age_group.get(age_group, set())
+            allowed = group_ids if allowed is None else allowed & group_ids
+        return allowed
+
+    # ---------------------------
+    # LOOKUP
+    # ---------------------------
+    def _prefix_ids(self, query):
+        # Full-name prefix, then word prefix; earlier tiers rank first
+        lo, hi = _prefix_range(self._keys, query)
+        yield from range(lo, hi)
+
+        lo, hi = _prefix_range(self._tokens, query)
+        yield from sorted(self._token_ids[lo:hi])
+
+    def _fuzzy_ids(self, query, limit):
+        for key in difflib.get_close_matches(query, self._keys, n=limit, cutoff=FUZZY_CUTOFF):
+            lo, hi = _prefix_range(self._keys, key)
+            yield from range(lo, hi)
+
+        for token in difflib.get_close_matches(query, self._token_set, n=limit, cutoff=FUZZY_CUTOFF):
+            lo, hi = _prefix_range(self._tokens, token)
+            yield from sorted(i for t, i in zip(self._tokens[lo:hi], self._token_ids[lo:hi]) if t == token)
+
+    def search(self, query="", team=None, age_group=None, limit=None):
+        # Returns matching names, best matches first (alphabetical with no query)
+        allowed = self._allowed(team, age_group)
+        query = _norm(query)
+
+        if not query:
+            ids = range(len(self.names)) if allowed is None else sorted(allowed)
+            ids = list(ids)[:limit] if limit is not None else ids
+            return [self.names[i] for i in ids]
+
+        results = self._collect(self._prefix_ids(query), allowed, limit)
+        if not results:
+            results = self._collect(self._fuzzy_ids(query, limit or len(self.names)), allowed, limit)
+        return results
+
+    def _collect(self, ids, allowed, limit):
+        results = []
+        seen = set()
+        for i in ids:
+            if i in seen or (allowed is not None and i not in allowed):
+                continue
+            seen.add(i)
+            results.append(self.names[i])
+            if limit is not None and len(results) >= limit:
+                break
+        return results
@@ -0,0 +1,80 @@
+import hashlib
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# GOOGLE SHEETS SOURCE
+# =========================
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly"
+]
+SPREADSHEET_NAME = "LCBTraining Data"
+WORKSHEET_NAME = "Data"
+
+NUMERIC_COLS = ["Attempt_1","Attempt_2","Attempt_3","Last_Attempt","Average","Highest","Lowest"]
+
+# Cheap fallback signal when Drive metadata is unavailable
+FINGERPRINT_RANGE = "A1:Z1"
+
+
+def clean_frame(records):
+    df = pd.DataFrame(records)
+
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+
+    df["full_name"] = df["Player_name_first"].fillna("") + " " + df["Player_name_last"].fillna("")
+    return df
+
+
+class SheetSource:
+    def __init__(self, creds_info):
+        self.creds_info = creds_info
+        self._spreadsheet = None
+
+    def spreadsheet(self):
+        # Opening by name is a Drive search, so the handle is kept. The Google
+        # client libraries are only imported once a fetch is actually needed.
+        if self._spreadsheet is None:
+            import gspread
+            from google.oauth2.service_account import Credentials
+
+            creds = Credentials.from_service_account_info(self.creds_info, scopes=SCOPES)
+            client = gspread.authorize(creds)
+            self._spreadsheet = client.open(SPREADSHEET_NAME)
+        return self._spreadsheet
+
+    def worksheet(self):
+        return self.spreadsheet().worksheet(WORKSHEET_NAME)
+
+    # ---------------------------
+    # CHANGE SIGNAL
+    # ---------------------------
+    def data_version(self):
+        # Drive's modifiedTime is a single small metadata request
+        try:
+            return "drive:" + self.spreadsheet().get_lastUpdateTime()
+        except Exception:
+            logger.warning("Drive modifiedTime unavailable; fingerprinting the sheet instead", exc_info=True)
+
+        # Header row plus the filled length of column A catches edits to the
+        # layout and appended/removed rows without pulling every record
+        ws = self.worksheet()
+        header = ws.get(FINGERPRINT_RANGE)
+        row_ids = ws.col_values(1)
+        digest = hashlib.sha1(repr((header, row_ids)).encode("utf-8")).hexdigest()
+        return "sheet:" + digest[:16]
+
+    # ---------------------------
+    # FULL FETCH
+    # ---------------------------
+    def fetch_frame(self):
+        return clean_frame(self.worksheet().get_all_records())
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from data_store import PartitionedStore
+from metrics import get_hitting_grade, get_speed_grade, player_profile, with_goal_status
+from aggregates import AGGREGATE_TABLES, AggregateState
+from dirty import Fingerprints
+
+# =========================
+# PRECOMPUTED SNAPSHOTS
+# =========================
+# A snapshot is everything the dashboard and API read, computed once offline:
+#
+#   <root>/manifest.json                 -> points at the current snapshot
+#   <root>/v-<hash>/store/...            -> PartitionedStore partitions
+#   <root>/v-<hash>/tables/<name>.parquet
+#   <root>/v-<hash>/reports/<player>.pdf -> only with --reports
+#
+# Each data version gets its own directory and the manifest is swapped in last,
+# so readers never see a half-written snapshot.
+#
+# Besides the API tables, a snapshot carries the running aggregates (agg_*)
+# and the per-player fingerprints, so the dashboard restores them instead of
+# recomputing them from the rows.
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOTS_KEPT = 2  # the current one plus the one readers may still hold
+
+FINGERPRINTS_TABLE = "fingerprints"
+TABLES = ["players", "summaries", "leaderboards", "teams", "team_metrics", FINGERPRINTS_TABLE] + list(AGGREGATE_TABLES)
+
+
+def snapshot_dir_name(version):
+    return "v-" + hashlib.sha1(str(version).encode("utf-8")).hexdigest()[:16]
+
+
+def report_file_name(player_name):
+    return f"{player_name.replace(' ', '_')}_LCB_Report.pdf"
+
+
+def read_manifest(root):
+    with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =========================
+# DERIVED TABLES
+# =========================
+def build_players_table(df):
+    rows = []
+    for player, player_df in df.groupby("full_name", sort=True):
+        age, team, age_group = player_profile(player_df)
+        hitting_grade, mph_to_a = get_hitting_grade(player_df, age_group)
+        speed_grade, sec_to_a = get_speed_grade(player_df, age_group)
+        rows.append({
+            "Player": player,
+            "player_id": player_df["player_id"].iloc[0] if "player_id" in player_df else None,
+            "Team": team,
+            "Age": age,
+            "Age Group": age_group,
+            "Hitting Grade": hitting_grade,
+            "MPH to A": mph_to_a,
+            "Speed Grade": speed_grade,
+            "Sec to A": sec_to_a,
+            "Tests": len(player_df),
+            "Last Test": player_df["Date"].max(),
+        })
+
+    columns = ["Player", "player_id", "Team", "Age", "Age Group", "Hitting Grade", "MPH to A",
+               "Speed Grade", "Sec to A", "Tests", "Last Test"]
+    players = pd.DataFrame(rows, columns=columns)
+    players["Age"] = players["Age"].astype("Int64")
+    players[["MPH to A", "Sec to A"]] = players[["MPH to A", "Sec to A"]].apply(pd.to_numeric, errors="coerce")
+    return players
+
+
+def build_summaries_table(players, aggregates):
+    # All-time summaries come straight from the running aggregates
+    from exports import SUMMARY_COLUMNS
+
+    chunks = []
+    for player, team, age_group in zip(players["Player"], players["Team"], players["Age Group"]):
+        summary = aggregates.results_summary(player, age_group)
+        summary.insert(0, "Age Group", age_group)
+        summary.insert(0, "Team", team)
+        summary.insert(0, "Player", player)
+        chunks.append(summary)
+
+    if not chunks:
+        return with_goal_status(pd.DataFrame(columns=SUMMARY_COLUMNS))
+    return with_goal_status(pd.concat(chunks, ignore_index=True))
+
+
+def build_leaderboards_table(store):
+    import exports
+
+    return pd.concat(list(exports.iter_export("Leaderboards", store)), ignore_index=True)
+
+
+def build_team_tables(df, aggregates):
+    teams = []
+    team_metrics = []
+    for team, team_df in df.groupby("Team", sort=True):
+        avg_age, means = aggregates.team_means(team)
+        teams.append({"Team": team, "Players": team_df["full_name"].nunique(), "Avg Age": avg_age})
+        team_metrics.extend({"Team": team, "Metric": metric, "Average": mean} for metric, mean in sorted(means.items()))
+
+    return (
+        pd.DataFrame(teams, columns=["Team", "Players", "Avg Age"]),
+        pd.DataFrame(team_metrics, columns=["Team", "Metric", "Average"])
+    )
+
+
+def build_tables(df, store):
+    aggregates = AggregateState()
+    aggregates.update(df, store.version)
+    players = build_players_table(df)
+    teams, team_metrics = build_team_tables(df, aggregates)
+    return {
+        "players": players,
+        "summaries": build_summaries_table(players, aggregates),
+        "leaderboards": build_leaderboards_table(store),
+        "teams": teams,
+        "team_metrics": team_metrics,
+        FINGERPRINTS_TABLE: Fingerprints.from_frame(df, store.version).to_table(),
+        **aggregates.to_tables(),
+    }
+
+
+# =========================
+# WRITING
+# =========================
+def write_snapshot(root, df, version, tables=None, write_reports=None):
+    # Returns the new snapshot directory. write_reports(directory) may fill the
+    # reports/ folder before the manifest is switched over.
+    os.makedirs(root, exist_ok=True)
+    store = PartitionedStore.from_frame(df, version=version)
+    if tables is None:
+        tables = build_tables(df, store)
+
+    name = snapshot_dir_name(version)
+    final_dir = os.path.join(root, name)
+    work_dir = os.path.join(root, f".{name}.tmp-{os.getpid()}")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    store.save(os.path.join(work_dir, "store"))
+    os.makedirs(os.path.join(work_dir, "tables"))
+    for table_name, table in tables.items():
+        table.to_parquet(os.path.join(work_dir, "tables", f"{table_name}.parquet"), index=False)
+
+    reports = 0
+    if write_reports is not None:
+        reports_dir = os.path.join(work_dir, "reports")
+        os.makedirs(reports_dir)
+        reports = write_reports(reports_dir)
+
+    if os.path.exists(final_dir):
+        shutil.rmtree(final_dir)
+    os.replace(work_dir, final_dir)
+
+    manifest = {
+        "version": version,
+        "snapshot": name,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": len(df),
+        "players": int(df["full_name"].nunique()) if "full_name" in df else 0,
+        "tables": sorted(tables),
+        "reports": reports,
+    }
+    manifest_tmp = os.path.join(root, f".{MANIFEST_NAME}.tmp-{os.getpid()}")
+    with open(manifest_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_tmp, os.path.join(root, MANIFEST_NAME))
+
+    prune_snapshots(root, keep=name)
+    return final_dir
+
+
+def prune_snapshots(root, keep):
+    snapshots = [
+        entry for entry in os.scandir(root)
+        if entry.is_dir() and entry.name.startswith("v-") and entry.name != keep
+    ]
+    snapshots.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in snapshots[SNAPSHOTS_KEPT - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# =========================
+# READING
+# =========================
+class Snapshot:
+    def __init__(self, root, version=None):
+        # Pin to a given data version, or to whatever the manifest points at now
+        self.root = root
+        if version is None:
+            manifest = read_manifest(root)
+            version = manifest["version"]
+        self.version = version
+        self.path = os.path.join(root, snapshot_dir_name(version))
+        self._tables = {}
+
+    def store(self, start=None, end=None, player_versions=None):
+        return PartitionedStore.load(
+            os.path.join(self.path, "store"), start, end, version=self.version, player_versions=player_versions
+        )
+
+    def frame(self):
+        return self.store().scan()
+
+    def has_table(self, name):
+        return os.path.exists(os.path.join(self.path, "tables", f"{name}.parquet"))
+
+    def table(self, name, cache=True):
+        if name in self._tables:
+            return self._tables[name]
+        table = pd.read_parquet(os.path.join(self.path, "tables", f"{name}.parquet"))
+        if cache:
+            self._tables[name] = table
+        return table
+
+    # Snapshots written before these tables existed return None, and the
+    # caller computes them from the rows instead
+    def aggregate_tables(self):
+        if not all(self.has_table(name) for name in AGGREGATE_TABLES):
+            return None
+        return {name: self.table(name, cache=False) for name in AGGREGATE_TABLES}
+
+    def fingerprints(self):
+        if not self.has_table(FINGERPRINTS_TABLE):
+            return None
+        return Fingerprints.from_table(self.table(FINGERPRINTS_TABLE, cache=False), self.version)
+
+    def report_path(self, player_name):
+        path = os.path.join(self.path, "reports", report_file_name(player_name))
+        return path if os.path.exists(path) else None
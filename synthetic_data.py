@@ -0,0 +1,58 @@
+import random
+import tempfile
+from datetime import date
+
+# =========================
+# SYNTHETIC DATA STAND-IN
+# =========================
+# Sheet-shaped training rows with a fixed seed, for the tests and the load
+# test (loadtest.py), so neither needs Google access. Ten metrics on four test
+# days a season, with about a quarter of the player/day/metric rows missing.
+
+SYNTHETIC_METRICS = {
+    # metric: (mean, sd)
+    "10 yard sprint": (2.1, 0.3), "Pro Agility": (5.0, 0.4), "Home to 1B sprint": (4.9, 0.4),
+    "BES Tee": (58, 10), "BES Flip": (62, 10), "Arm Speed Pitch": (48, 8),
+    "Arm Speed Reg": (52, 8), "Bench": (85, 20), "Squat": (110, 25), "Broad Jump": (6.5, 1),
+}
+SYNTHETIC_TEAMS = ["Hawks 8U", "Hawks 10U", "Hawks 12U", "Storm 12U", "Storm 14U", "Storm 16U"]
+FIRST_NAMES = ["Jack", "Liam", "Noah", "Mason", "Eli", "Owen", "Luke", "Cole", "Ryan", "Evan", "Ben", "Max"]
+LAST_NAMES = ["Smith", "Brown", "Jones", "Miller", "Davis", "Wilson", "Moore", "Clark", "Hall", "Young"]
+
+
+def synthetic_frame(players=200, seasons=2, seed=7):
+    from sheets import clean_frame
+
+    rnd = random.Random(seed)
+    first_season = date.today().year - seasons + 1
+    test_days = [date(first_season + s, month, 10) for s in range(seasons) for month in (2, 5, 8, 11)]
+
+    rows = []
+    for p in range(players):
+        first, last = rnd.choice(FIRST_NAMES), f"{rnd.choice(LAST_NAMES)}{p}"
+        team, age = rnd.choice(SYNTHETIC_TEAMS), rnd.randint(8, 15)
+        for day in test_days:
+            for metric, (mean, sd) in SYNTHETIC_METRICS.items():
+                if rnd.random() < 0.25:
+                    continue
+                attempts = [round(rnd.gauss(mean, sd), 2) for _ in range(3)]
+                rows.append({
+                    "player_id": f"P{p:05d}", "Player_name_first": first, "Player_name_last": last,
+                    "Team": team, "Age": age + (day.year - first_season), "Date": day.isoformat(),
+                    "Metric_Type": metric, "Attempt_1": attempts[0], "Attempt_2": attempts[1],
+                    "Attempt_3": attempts[2], "Last_Attempt": attempts[2],
+                    "Average": round(sum(attempts) / 3, 2), "Highest": max(attempts), "Lowest": min(attempts),
+                })
+    return clean_frame(rows)
+
+
+def synthetic_snapshot(players=200, seasons=2, seed=7, root=None):
+    # Writes a snapshot of synthetic_frame into root (a new temp directory by
+    # default) and returns (root, row count)
+    from data_store import frame_version
+    from snapshot import write_snapshot
+
+    df = synthetic_frame(players, seasons, seed)
+    root = root or tempfile.mkdtemp(prefix="lcb_synthetic_")
+    write_snapshot(root, df, "synthetic:" + frame_version(df))
+    return root, len(df)
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import AggregateState, FrameAggregates
+from data_store import PartitionedStore
+from metrics import build_leaderboard, build_results_summary, player_profile
+from synthetic_data import synthetic_frame
+
+# =========================
+# AGGREGATES VS FRAME BUILDERS
+# =========================
+# The running aggregates must always agree with the frame-based builders they
+# replace, whether they were built in one go, folded in incrementally, or
+# rebuilt after an earlier row was edited. So must the frame-based fallback
+# that serves reads while they are being built.
+
+AGE_CUTOFFS = [None, 10, 13]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return synthetic_frame(players=40, seasons=2, seed=3)
+
+
+def assert_matches(aggregates, df):
+    for metric in df["Metric_Type"].unique():
+        for max_age in AGE_CUTOFFS:
+            expected = build_leaderboard(df, metric, max_age).sort_values("full_name").reset_index(drop=True)
+            actual = aggregates.leaderboard(metric, max_age).sort_values("full_name").reset_index(drop=True)
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    for player, player_df in df.groupby("full_name"):
+        _, _, age_group = player_profile(player_df)
+        expected = build_results_summary(player_df, age_group).sort_values("Metric").reset_index(drop=True)
+        actual = aggregates.results_summary(player, age_group).sort_values("Metric").reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    assert_team_means_match(aggregates, df)
+
+
+def assert_team_means_match(aggregates, df):
+    for team, team_df in df.groupby("Team"):
+        avg_age, means = aggregates.team_means(team)
+        assert avg_age == pytest.approx(team_df["Age"].mean())
+        expected = team_df.groupby("Metric_Type")["Average"].mean()
+        assert means == pytest.approx(expected.to_dict())
+
+
+def updated(df, version, *previous):
+    aggregates = AggregateState()
+    for i, earlier in enumerate(previous):
+        aggregates.update(earlier, f"{version}-{i}")
+    aggregates.update(df, version)
+    return aggregates
+
+
+def with_value(df, metric, value):
+    # Copy of df with the first row of metric set to value
+    i = df.index[df["Metric_Type"] == metric][0]
+    edited = df.copy()
+    edited.loc[i, ["Average", "Highest", "Lowest"]] = value
+    return edited
+
+
+def test_full_build(frame):
+    assert_matches(updated(frame, "full"), frame)
+
+
+def test_appended_rows(frame):
+    prefix = frame.iloc[: len(frame) * 2 // 3].copy()
+    aggregates = updated(frame, "appended", prefix)
+    assert aggregates.row_count == len(frame)
+    assert_matches(aggregates, frame)
+
+
+def test_edited_row_raised(frame):
+    edited = with_value(frame, "BES Tee", 999.0)
+    aggregates = updated(edited, "raised", frame)
+    assert aggregates.leaderboard("BES Tee").iloc[0]["Highest"] == 999.0
+    assert_matches(aggregates, edited)
+
+
+def test_edited_row_corrected(frame):
+    typo = with_value(frame, "BES Tee", 999.0)
+    aggregates = updated(frame, "corrected", typo)
+    assert aggregates.leaderboard("BES Tee").iloc[0]["Highest"] != 999.0
+    assert_matches(aggregates, frame)
+
+
+def test_removed_row(frame):
+    removed = frame.drop(frame.index[0]).reset_index(drop=True)
+    aggregates = updated(removed, "removed", frame)
+    assert aggregates.row_count == len(removed)
+    assert_matches(aggregates, removed)
+
+
+def test_read_memo_follows_updates(frame):
+    aggregates = updated(frame, "memo")
+    before = aggregates.leaderboard("BES Tee")
+    aggregates.update(with_value(frame, "BES Tee", 999.0), "memo-edited")
+    after = aggregates.leaderboard("BES Tee")
+    assert not np.isclose(before.iloc[0]["Highest"], after.iloc[0]["Highest"])
+
+
+def test_undated_rows_in_team_means(frame):
+    undated = frame.copy()
+    undated.loc[undated.index[::7], "Date"] = pd.NaT
+    aggregates = updated(undated, "undated")
+    fallback = FrameAggregates(PartitionedStore.from_frame(undated))
+    assert_team_means_match(aggregates, undated)
+    assert_team_means_match(fallback, undated)
+    for team in undated["Team"].unique():
+        trend = aggregates.team_trend(team, ["BES Tee"])
+        assert trend["Date"].notna().all()
+        pd.testing.assert_frame_equal(fallback.team_trend(team, ["BES Tee"]), trend, check_dtype=False)
+
+
+def test_restored_from_tables(frame, tmp_path):
+    # Round-trip through parquet, the way a snapshot carries the state
+    tables = {}
+    for name, table in updated(frame, "saved").to_tables().items():
+        path = tmp_path / f"{name}.parquet"
+        table.to_parquet(path, index=False)
+        tables[name] = pd.read_parquet(path)
+
+    restored = AggregateState()
+    restored.load_tables(tables, "restored")
+    assert_matches(restored, frame)
+
+
+def test_frame_fallback(frame):
+    assert_matches(FrameAggregates(PartitionedStore.from_frame(frame)), frame)
+
+
+def test_frame_fallback_team_trend(frame):
+    aggregates = updated(frame, "trend")
+    fallback = FrameAggregates(PartitionedStore.from_frame(frame))
+    for team in frame["Team"].unique():
+        expected = aggregates.team_trend(team, ["BES Tee", "Pro Agility"])
+        actual = fallback.team_trend(team, ["BES Tee", "Pro Agility"])
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
@@ -0,0 +1,182 @@
+import http.client
+import json
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+import pytest
+
+from api import make_server
+from exports import leaderboard_table
+from metrics import lower_is_better
+from snapshot import MANIFEST_NAME
+from synthetic_data import synthetic_frame, synthetic_snapshot
+
+# =========================
+# JSON API OVER A SYNTHETIC SNAPSHOT
+# =========================
+# Runs the real HTTP server on a free port against a snapshot written by
+# synthetic_snapshot, so routes, ETags and errors are checked end to end with
+# no Google access.
+
+SNAPSHOT_ARGS = dict(players=40, seasons=2, seed=3)
+AGE_CUTOFFS = [10, 12, 13]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return synthetic_frame(**SNAPSHOT_ARGS)
+
+
+@pytest.fixture(scope="module")
+def root(tmp_path_factory):
+    root, _ = synthetic_snapshot(**SNAPSHOT_ARGS, root=str(tmp_path_factory.mktemp("snapshot")))
+    return root
+
+
+@pytest.fixture(scope="module")
+def server(root):
+    server = make_server(root, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, etag=None):
+    # (status, ETag header, decoded JSON body or None)
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    try:
+        conn.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+        response = conn.getresponse()
+        body = response.read()
+        return response.status, response.getheader("ETag"), json.loads(body) if body else None
+    finally:
+        conn.close()
+
+
+# ---------------------------
+# ROUTES
+# ---------------------------
+def test_version(server, root):
+    status, _, manifest = get(server, "/version")
+    assert status == 200
+    with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+        assert manifest == json.load(f)
+
+
+def test_players(server, frame):
+    status, _, players = get(server, "/players")
+    assert status == 200
+    assert sorted(p["Player"] for p in players) == sorted(frame["full_name"].unique())
+
+    team = frame["Team"].iloc[0]
+    _, _, on_team = get(server, f"/players?team={quote(team)}")
+    assert on_team and all(p["Team"] == team for p in on_team)
+
+
+def test_player(server, frame):
+    player = frame["full_name"].iloc[0]
+    status, _, body = get(server, f"/players/{quote(player)}")
+    assert status == 200
+    assert body["Player"] == player
+    assert sorted(row["Metric"] for row in body["summary"]) == sorted(
+        frame.loc[frame["full_name"] == player, "Metric_Type"].unique()
+    )
+
+
+def test_teams(server, frame):
+    _, _, teams = get(server, "/teams")
+    assert sorted(t["Team"] for t in teams) == sorted(frame["Team"].unique())
+
+    team = frame["Team"].iloc[0]
+    status, _, body = get(server, f"/teams/{quote(team)}")
+    assert status == 200
+    assert body["Avg Age"] == pytest.approx(frame.loc[frame["Team"] == team, "Age"].mean())
+
+
+# ---------------------------
+# LEADERBOARDS
+# ---------------------------
+def assert_board_matches(board, expected):
+    # Same players, ages and bests; ranks follow the returned order
+    assert [row["Rank"] for row in board] == list(range(1, len(board) + 1))
+    actual = pd.DataFrame(board, columns=["full_name", "Age", "Best"]).sort_values("full_name")
+    expected = expected[["full_name", "Age", "Best"]].sort_values("full_name")
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("metric", ["BES Tee", "10 yard sprint"])
+@pytest.mark.parametrize("max_age", [None] + AGE_CUTOFFS)
+def test_leaderboard_matches_dashboard(server, frame, metric, max_age):
+    query = "?limit=1000" + (f"&max_age={max_age}" if max_age is not None else "")
+    status, _, board = get(server, f"/leaderboard/{quote(metric)}{query}")
+    assert status == 200
+    expected = leaderboard_table(frame[frame["Metric_Type"] == metric], metric, max_age)
+    assert_board_matches(board, expected)
+
+    bests = [row["Best"] for row in board]
+    assert bests == sorted(bests, reverse=metric not in lower_is_better)
+
+
+def test_leaderboard_limit(server):
+    _, _, board = get(server, "/leaderboard/BES%20Tee?limit=3&max_age=12")
+    assert [row["Rank"] for row in board] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("query, message", [
+    ("limit=-1", "limit must be at least 1"),
+    ("limit=0", "limit must be at least 1"),
+    ("limit=abc", "limit must be an integer"),
+    ("max_age=ten", "max_age must be an integer"),
+])
+def test_leaderboard_bad_params(server, query, message):
+    status, _, body = get(server, f"/leaderboard/BES%20Tee?{query}")
+    assert status == 400
+    assert body == {"error": message}
+
+
+# ---------------------------
+# ETAGS + ERRORS
+# ---------------------------
+def test_not_modified(server):
+    status, etag, _ = get(server, "/players")
+    assert status == 200 and etag
+    assert get(server, "/players", etag)[0] == 304
+    assert get(server, "/teams", etag)[0] == 304
+    assert get(server, "/players", '"stale"')[0] == 200
+
+
+@pytest.mark.parametrize("path", ["/players/nobody", "/teams/nobody", "/leaderboard/nothing", "/nowhere"])
+def test_unknown_paths_are_404_even_when_tag_matches(server, path):
+    _, etag, _ = get(server, "/players")
+    assert get(server, path)[0] == 404
+    assert get(server, path, etag)[0] == 404
+    assert get(server, path, "*")[0] == 404
+
+
+def test_version_tag_follows_rebuild(server, root):
+    _, data_tag, _ = get(server, "/players")
+    _, version_tag, _ = get(server, "/version")
+    assert version_tag != data_tag
+
+    # A --force rebuild of the same data version writes a new manifest
+    path = os.path.join(root, MANIFEST_NAME)
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["created"] = "2000-01-01T00:00:00+00:00"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+    status, rebuilt_tag, body = get(server, "/version", version_tag)
+    assert status == 200
+    assert rebuilt_tag != version_tag
+    assert body["created"] == manifest["created"]
+    assert get(server, "/players", data_tag)[0] == 304
@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+
+import pandas as pd
+
+from metrics import (
+    baseball_metrics, speed_metrics, player_profile,
+    build_results_summary, build_best_table, with_goal_status
+)
+
+# =========================
+# MEMORY-BOUNDED LRU CACHE
+# =========================
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if hasattr(value, "__dataclass_fields__"):
+        return sum(estimate_size(getattr(value, f.name)) for f in fields(value))
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    # Process-wide cache capped by the estimated size of its values, not entry count
+    def __init__(self, max_bytes, sizeof=estimate_size):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # too big to cache at all
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_build(self, key, build):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, build())
+        return value
+
+    def discard(self, predicate):
+        # Drop every entry whose key matches; returns how many were dropped
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self.bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# =========================
+# PER-PLAYER DERIVED VIEWS
+# =========================
+@dataclass(frozen=True)
+class PlayerViews:
+    player_df: pd.DataFrame
+    summary_df: pd.DataFrame
+    best_df: pd.DataFrame
+    strength_df: pd.DataFrame
+    speed_df: pd.DataFrame
+    player_age: object
+    player_team: str
+    age_group: str
+
+    @property
+    def empty(self):
+        return self.player_df.empty
+
+    def metric_summary(self, metric):
+        # (first, best, growth) for the KPI cards
+        row = self.summary_df[self.summary_df["Metric"] == metric]
+        if row.empty:
+            return None, None, None
+        row = row.iloc[0]
+        return row["First"], row["Best"], row["Growth"]
+
+
+def with_month(df):
+    return df.assign(Month=df["Date"].dt.month)
+
+
+def build_player_views(store, player, start=None, end=None, aggregates=None):
+    player_df = store.scan(start, end, full_name=player)
+    if player_df.empty:
+        return PlayerViews(player_df, pd.DataFrame(), pd.DataFrame(), player_df, player_df, None, "N/A", "N/A")
+
+    player_age, player_team, age_group = player_profile(player_df)
+
+    # All-time summaries are already maintained by the running aggregates
+    if aggregates is not None and start is None and end is None:
+        summary_df = aggregates.results_summary(player, age_group)
+    else:
+        summary_df = build_results_summary(player_df, age_group)
+
+    return PlayerViews(
+        player_df=player_df,
+        summary_df=with_goal_status(summary_df),
+        best_df=build_best_table(player_df),
+        strength_df=with_month(player_df[player_df["Metric_Type"].isin(baseball_metrics)]),
+        speed_df=with_month(player_df[player_df["Metric_Type"].isin(speed_metrics)]),
+        player_age=player_age,
+        player_team=player_team,
+        age_group=age_group
+    )
+
+
+PLAYER_VIEW_CACHE_MB = int(os.environ.get("LCB_PLAYER_VIEW_CACHE_MB", "64"))
+player_view_cache = LRUCache(PLAYER_VIEW_CACHE_MB * 1024 * 1024)
+
+
+def get_player_views(store, player, start=None, end=None, aggregates=None):
+    # Keyed on the player's own rows, so a refresh that didn't touch them
+    # still hits (see dirty.py)
+    key = (player, start, end, store.player_version(player))
+    return player_view_cache.get_or_build(
+        key,
+        lambda: build_player_views(store, player, start, end, aggregates)
+    )
@@ -0,0 +1,186 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from metrics import baseball_metrics, speed_metrics, targets
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# STARTUP WARM-UP
+# =========================
+# The server start hook in app.py loads the data and starts a background thread
+# (after that, the first run that sees a new data version starts it). It first
+# builds (or restores) the running aggregates, which runs before it finishes
+# read around (see FrameAggregates), then fills every read cache the tabs hit
+# with their default filters:
+#
+#   - each metric's leaderboard, for all ages and for every age option
+#   - each team's KPIs and trend lines over all seasons
+#   - the cached views of the most-viewed players
+#   - optionally, the PDF reports of the most-viewed players
+#
+# Sessions then find the data loaded and these reads already cached. Under a
+# plain `streamlit run dashboard.py` the first run pays for loading the data.
+#
+#   LCB_WARMUP=0              skip the cache warming (the aggregates are still built)
+#   LCB_WARMUP_PLAYERS=25     most-viewed players whose views are prebuilt
+#   LCB_WARMUP_REPORTS=0      most-viewed players whose reports are rendered
+#   LCB_VIEW_COUNTS=path      where player view counts persist across restarts
+#                             (default: $XDG_STATE_HOME/lcb-training/view_counts.json)
+
+WARMUP_ENABLED = os.environ.get("LCB_WARMUP", "1") != "0"
+WARMUP_PLAYERS = int(os.environ.get("LCB_WARMUP_PLAYERS", "25"))
+WARMUP_REPORTS = int(os.environ.get("LCB_WARMUP_REPORTS", "0"))
+# Kept in the user's state directory, not the working tree the app runs from
+STATE_DIR = os.path.join(os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state"), "lcb-training")
+VIEW_COUNTS_PATH = os.environ.get("LCB_VIEW_COUNTS", os.path.join(STATE_DIR, "view_counts.json"))
+VIEW_COUNTS_FLUSH_SECONDS = 60
+
+
+# =========================
+# PLAYER VIEW COUNTER
+# =========================
+class ViewCounter:
+    # Counts player page views and persists them to a small JSON file, at most
+    # once every flush_seconds, so popularity survives restarts
+    def __init__(self, path=VIEW_COUNTS_PATH, flush_seconds=VIEW_COUNTS_FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._dirty = False
+        self._flushed = time.monotonic()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._counts.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        atexit.register(self.flush)
+
+    def hit(self, player):
+        with self._lock:
+            self._counts[player] += 1
+            self._dirty = True
+            due = time.monotonic() - self._flushed >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def top(self, n):
+        with self._lock:
+            return [player for player, _ in self._counts.most_common(n)]
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            counts = dict(self._counts)
+            self._dirty = False
+            self._flushed = time.monotonic()
+        tmp = f"{self.path}.tmp-{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(counts, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning("Could not save player view counts to %s", self.path, exc_info=True)
+
+
+# =========================
+# WARM-UP
+# =========================
+def target_metrics():
+    # Every metric with a goal in any age group, in first-seen order
+    return list(dict.fromkeys(metric for goals in targets.values() for metric in goals))
+
+
+def default_window(store):
+    # What date_range_control selects before the user touches it ("All Seasons")
+    return None, None
+
+
+class Warmup:
+    def __init__(self, store, aggregates, options, counter, refresh_aggregates=None,
+                 players=WARMUP_PLAYERS, reports=WARMUP_REPORTS):
+        # refresh_aggregates() brings `aggregates` up to the store's version
+        self.store = store
+        self.aggregates = aggregates
+        self.refresh_aggregates = refresh_aggregates
+        self.options = options
+        self.counter = counter
+        self.players = players
+        self.reports = reports
+        self.status = "pending"
+        self.step = None
+        self.timings = {}  # step -> seconds
+        self._thread = threading.Thread(target=self._run, name="lcb-warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _timed(self, step, fn):
+        self.step = step
+        started = time.perf_counter()
+        fn()
+        self.timings[step] = time.perf_counter() - started
+
+    def _run(self):
+        self.status = "running"
+        started = time.perf_counter()
+        try:
+            if self.refresh_aggregates is not None:
+                self._timed("aggregates", self.refresh_aggregates)
+            if WARMUP_ENABLED:
+                self._timed("leaderboards", self.warm_leaderboards)
+                self._timed("teams", self.warm_teams)
+                self._timed("players", self.warm_players)
+                self._timed("reports", self.warm_reports)
+        except Exception:
+            self.status = "failed"
+            logger.exception("Warm-up failed during %s", self.step)
+            return
+        self.status = "done"
+        self.step = None
+        logger.info(
+            "Warm-up for %s done in %.1fs (%s)",
+            self.store.version,
+            time.perf_counter() - started,
+            ", ".join(f"{step} {seconds:.2f}s" for step, seconds in self.timings.items())
+        )
+
+    def warm_leaderboards(self):
+        for metric in target_metrics():
+            for max_age in [None] + list(self.options["ages"]):
+                self.aggregates.leaderboard(metric, max_age)
+
+    def warm_teams(self):
+        start, end = default_window(self.store)
+        for team in self.options["teams"]:
+            self.aggregates.team_means(team, start, end)
+            self.aggregates.team_trend(team, baseball_metrics, start, end)
+            self.aggregates.team_trend(team, speed_metrics, start, end)
+
+    def warm_players(self):
+        from view_cache import get_player_views
+
+        start, end = default_window(self.store)
+        for player in self.counter.top(self.players):
+            get_player_views(self.store, player, start, end, self.aggregates)
+
+    def warm_reports(self):
+        if not self.reports:
+            return
+        from jobs import submit_player_report
+        from view_cache import get_player_views
+
+        window = default_window(self.store)
+        for player in self.counter.top(self.reports):
+            views = get_player_views(self.store, player, *window, self.aggregates)
+            if not views.empty:
+                submit_player_report(views, player, window=window, data_version=self.store.player_version(player))